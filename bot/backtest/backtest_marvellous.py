@@ -4,16 +4,7 @@ import config
 from .. import marvellous_config as mc
 from ..data_loader import fetch_data_yfinance, load_data_csv
 from ..strategies import MarvellousStrategy
-from .common import _stats_dict, get_pip_size_for_symbol, _apply_backtest_realism, _apply_gold_manual_sl_override, _calc_trade_pnl, _update_per_day_session
-
-
-def _strip_tz(df):
-    if df is None or df.empty:
-        return df
-    if df.index.tz is not None:
-        df = df.copy()
-        df.index = df.index.tz_convert(None)
-    return df
+from .common import _clear_symbol_caches, _stats_dict, get_pip_size_for_symbol, _calc_trade_pnl, _count_per_day_session, _coerce_signal_dtypes, _valid_sl_mask, _resolve_trade_outcomes, _bar_arrays, _strip_tz, _resample_cached
 
 
 def run_marvellous_backtest(
@@ -29,6 +20,7 @@ def run_marvellous_backtest(
     df_entry=None,
 ):
     """Run Marvellous backtest. Entry TF from config (5m, 15m, or 1m)."""
+    _clear_symbol_caches()
     agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
     display_period = period or getattr(config, "BACKTEST_PERIOD", "60d")
     period_note = ""
@@ -36,14 +28,14 @@ def run_marvellous_backtest(
 
     if df_h1 is not None and df_m15 is not None and df_entry is not None:
         if df_daily is None:
-            df_daily = df_h1.resample("1D").agg(agg).dropna()
+            df_daily = _resample_cached(df_h1, "1D")
         if df_4h is None:
-            df_4h = df_h1.resample("4h").agg(agg).dropna()
+            df_4h = _resample_cached(df_h1, "4h")
     elif csv_path:
         df = load_data_csv(csv_path)
         df_h1 = df.resample("1h").agg(agg).dropna()
-        df_4h = df_h1.resample("4h").agg(agg).dropna()
-        df_daily = df_h1.resample("1D").agg(agg).dropna()
+        df_4h = _resample_cached(df_h1, "4h")
+        df_daily = _resample_cached(df_h1, "1D")
         df_m15 = df.resample("15min").agg(agg).dropna()
         if entry_tf == "15m":
             df_entry = df_m15.copy()
@@ -62,8 +54,8 @@ def run_marvellous_backtest(
             period_note = f" (Yahoo 15m limit; {period} requested)" if period != "60d" else ""
         display_period = fetch_period
         df_h1 = fetch_data_yfinance(symbol, period=fetch_period, interval="1h")
-        df_4h = df_h1.resample("4h").agg(agg).dropna()
-        df_daily = df_h1.resample("1D").agg(agg).dropna()
+        df_4h = _resample_cached(df_h1, "4h")
+        df_daily = _resample_cached(df_h1, "1D")
         df_m15 = fetch_data_yfinance(symbol, period=fetch_period, interval="15m")
         if entry_tf == "1m":
             df_entry = fetch_data_yfinance(symbol, period=fetch_period, interval="1m")
@@ -72,9 +64,9 @@ def run_marvellous_backtest(
         else:
             df_entry = fetch_data_yfinance(symbol, period=fetch_period, interval="5m")
 
-    for d in (df_daily, df_4h, df_h1, df_m15, df_entry):
-        if d is not None:
-            _strip_tz(d)
+    df_daily, df_4h, df_h1, df_m15, df_entry = (
+        _strip_tz(d) for d in (df_daily, df_4h, df_h1, df_m15, df_entry)
+    )
 
     used_symbol = symbol or getattr(mc, "MARVELLOUS_BACKTEST_SYMBOL", "GC=F")
     strat = MarvellousStrategy(
@@ -87,24 +79,14 @@ def run_marvellous_backtest(
         verbose=False,
     )
     strat.prepare_data()
-    signals = strat.run_backtest()
+    signals = _coerce_signal_dtypes(strat.run_backtest())
 
-    def _valid_sl(trade):
-        sl, price = trade.get("sl"), trade.get("price")
-        if sl is None or price is None:
-            return False
-        try:
-            sl_f, price_f = float(sl), float(price)
-        except (TypeError, ValueError):
-            return False
-        if trade["type"] == "BUY" and sl_f >= price_f:
-            return False
-        if trade["type"] == "SELL" and sl_f <= price_f:
-            return False
-        return True
-
-    invalid_sl = signals[~signals.apply(_valid_sl, axis=1)] if not signals.empty else pd.DataFrame()
-    signals = signals[signals.apply(_valid_sl, axis=1)] if not signals.empty else pd.DataFrame()
+    if signals.empty:
+        invalid_sl = pd.DataFrame()
+    else:
+        valid = _valid_sl_mask(signals)
+        invalid_sl = signals[~valid]
+        signals = signals[valid]
 
     risk = getattr(config, "RISK_REWARD_RATIO", 5.0)
     lock_in_enabled = getattr(config, "LOCK_IN_ENABLED", True)
@@ -141,101 +123,29 @@ def run_marvellous_backtest(
     total_profit = 0.0
     total_loss = 0.0
     trade_details = [] if include_trade_details else None
-    per_day = {}
-    per_session = {}
 
-    for _, trade in signals.iterrows():
-        entry_price = trade["price"]
-        stop_loss = trade["sl"]
-        trade_time = trade["time"]
-        adj_entry, adj_sl, commission = _apply_backtest_realism(
-            entry_price, stop_loss, trade["type"], used_symbol, entry_price
-        )
-        adj_sl = _apply_gold_manual_sl_override(used_symbol, adj_entry, adj_sl, trade["type"])
-        spread_cost = abs(adj_entry - entry_price)
-        future_prices = df_entry.loc[df_entry.index > trade_time]
-        if future_prices.empty:
-            continue
-        if trade["type"] == "BUY":
-            sl_dist = adj_entry - adj_sl
-            tp_price = trade.get("tp")
-            if tp_price is None or tp_price <= adj_entry:
-                tp_price = adj_entry + (sl_dist * risk)
-            lock_in_sl = adj_entry + (sl_dist * lock_in_at) if lock_in_enabled else None
-            lock_in_trigger_price = adj_entry + (sl_dist * lock_in_trigger) if lock_in_enabled else None
-            outcome = None
-            outcome_rr = risk
-            lock_in_triggered = False
-            for idx, bar in future_prices.iterrows():
-                if lock_in_enabled and lock_in_trigger_price and lock_in_sl and bar["high"] >= lock_in_trigger_price:
-                    lock_in_triggered = True
-                effective_sl = lock_in_sl if lock_in_triggered else adj_sl
-                if bar["low"] <= effective_sl:
-                    outcome = "LOSS" if effective_sl == adj_sl else "WIN"
-                    outcome_rr = 0.0 if outcome == "LOSS" else lock_in_at
-                    break
-                if bar["high"] >= tp_price:
-                    outcome = "WIN"
-                    outcome_rr = risk
-                    break
-            if outcome == "WIN":
-                profit = _calc_trade_pnl(used_symbol, balance, config.RISK_PER_TRADE, sl_dist, "WIN", outcome_rr, spread_cost)
-                total_profit += profit
-                balance += profit
-                wins += 1
-                buys += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "WIN"))
-            elif outcome == "LOSS":
-                loss = _calc_trade_pnl(used_symbol, balance, config.RISK_PER_TRADE, sl_dist, "LOSS", 0, spread_cost)
-                total_loss += loss
-                balance -= loss
-                losses += 1
-                buys += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "LOSS"))
-        elif trade["type"] == "SELL":
-            sl_dist = adj_sl - adj_entry
-            tp_price = trade.get("tp")
-            if tp_price is None or tp_price >= adj_entry:
-                tp_price = adj_entry - (sl_dist * risk)
-            lock_in_sl = adj_entry - (sl_dist * lock_in_at) if lock_in_enabled else None
-            lock_in_trigger_price = adj_entry - (sl_dist * lock_in_trigger) if lock_in_enabled else None
-            outcome = None
-            outcome_rr = risk
-            lock_in_triggered = False
-            for idx, bar in future_prices.iterrows():
-                if lock_in_enabled and lock_in_trigger_price and lock_in_sl and bar["low"] <= lock_in_trigger_price:
-                    lock_in_triggered = True
-                effective_sl = lock_in_sl if lock_in_triggered else adj_sl
-                if bar["high"] >= effective_sl:
-                    outcome = "LOSS" if effective_sl == adj_sl else "WIN"
-                    outcome_rr = 0.0 if outcome == "LOSS" else lock_in_at
-                    break
-                if bar["low"] <= tp_price:
-                    outcome = "WIN"
-                    outcome_rr = risk
-                    break
-            if outcome == "WIN":
-                profit = _calc_trade_pnl(used_symbol, balance, config.RISK_PER_TRADE, sl_dist, "WIN", outcome_rr, spread_cost)
-                total_profit += profit
-                balance += profit
-                wins += 1
-                sells += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "WIN"))
-            elif outcome == "LOSS":
-                loss = _calc_trade_pnl(used_symbol, balance, config.RISK_PER_TRADE, sl_dist, "LOSS", 0, spread_cost)
-                total_loss += loss
-                balance -= loss
-                losses += 1
-                sells += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "LOSS"))
+    entry_index, entry_highs, entry_lows = _bar_arrays(df_entry)
+
+    trades = _resolve_trade_outcomes(
+        signals, used_symbol, entry_index, entry_highs, entry_lows, risk, lock_in_enabled, lock_in_trigger, lock_in_at
+    )
+    for t in trades.itertuples(index=False):
+        pnl = _calc_trade_pnl(used_symbol, balance, config.RISK_PER_TRADE, t.sl_dist, t.outcome, t.outcome_rr, t.spread_cost)
+        if t.outcome == "WIN":
+            total_profit += pnl
+            balance += pnl
+            wins += 1
+        else:
+            total_loss += pnl
+            balance -= pnl
+            losses += 1
+        if t.type == "BUY":
+            buys += 1
+        else:
+            sells += 1
+        if trade_details is not None:
+            trade_details.append((t.time, t.outcome))
+    per_day, per_session = _count_per_day_session(trades["time"])
 
     if return_stats:
         d = _stats_dict(
@@ -16,16 +16,7 @@ import config
 from .. import vester_config as vc
 from ..data_loader import fetch_data_yfinance, load_data_csv
 from ..strategies import VesterStrategy
-from .common import _stats_dict, get_pip_size_for_symbol, _apply_backtest_realism, _apply_gold_manual_sl_override, _calc_trade_pnl, _update_per_day_session
-
-
-def _strip_tz(df):
-    if df is None or df.empty:
-        return df
-    if df.index.tz is not None:
-        df = df.copy()
-        df.index = df.index.tz_convert(None)
-    return df
+from .common import _clear_symbol_caches, _stats_dict, get_pip_size_for_symbol, _calc_trade_pnl, _count_per_day_session, _day_session_labels, _coerce_signal_dtypes, _valid_sl_mask, _resolve_trade_outcomes, _bar_arrays, _strip_tz, _resample_cached
 
 
 def run_vester_backtest(
@@ -40,6 +31,7 @@ def run_vester_backtest(
     df_h4=None,
 ):
     """Run Vester backtest. Uses 1H, 5M, 1M timeframes. Optional 4H when VESTER_REQUIRE_4H_BIAS=True."""
+    _clear_symbol_caches()
     agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
     display_period = period or getattr(config, "BACKTEST_PERIOD", "60d")
     period_note = ""
@@ -62,10 +54,8 @@ def run_vester_backtest(
         df_m1 = fetch_data_yfinance(symbol, period=fetch_period, interval="1m")
 
     if df_h4 is None and df_h1 is not None:
-        df_h4 = df_h1.resample("4h").agg(agg).dropna()
-    for d in (df_h1, df_m5, df_m1, df_h4):
-        if d is not None:
-            _strip_tz(d)
+        df_h4 = _resample_cached(df_h1, "4h")
+    df_h1, df_m5, df_m1, df_h4 = (_strip_tz(d) for d in (df_h1, df_m5, df_m1, df_h4))
 
     used_symbol = symbol or getattr(config, "VESTER_BACKTEST_SYMBOL", vc.VESTER_BACKTEST_SYMBOL)
     strat = VesterStrategy(
@@ -77,24 +67,14 @@ def run_vester_backtest(
         verbose=False,
     )
     strat.prepare_data()
-    signals = strat.run_backtest()
+    signals = _coerce_signal_dtypes(strat.run_backtest())
 
-    def _valid_sl(trade):
-        sl, price = trade.get("sl"), trade.get("price")
-        if sl is None or price is None:
-            return False
-        try:
-            sl_f, price_f = float(sl), float(price)
-        except (TypeError, ValueError):
-            return False
-        if trade["type"] == "BUY" and sl_f >= price_f:
-            return False
-        if trade["type"] == "SELL" and sl_f <= price_f:
-            return False
-        return True
-
-    invalid_sl = signals[~signals.apply(_valid_sl, axis=1)] if not signals.empty else pd.DataFrame()
-    signals = signals[signals.apply(_valid_sl, axis=1)] if not signals.empty else pd.DataFrame()
+    if signals.empty:
+        invalid_sl = pd.DataFrame()
+    else:
+        valid = _valid_sl_mask(signals)
+        invalid_sl = signals[~valid]
+        signals = signals[valid]
 
     risk = getattr(config, "RISK_REWARD_RATIO", 5.0)
     lock_in_enabled = getattr(config, "LOCK_IN_ENABLED", True)
@@ -134,110 +114,31 @@ def run_vester_backtest(
     total_loss = 0.0
     trade_details = [] if include_trade_details else None
     losing_trades = [] if include_trade_details else None
-    per_day = {}
-    per_session = {}
 
-    for _, trade in signals.iterrows():
-        entry_price = trade["price"]
-        stop_loss = trade["sl"]
-        trade_time = trade["time"]
-        adj_entry, adj_sl, commission = _apply_backtest_realism(
-            entry_price, stop_loss, trade["type"], used_symbol, entry_price
-        )
-        adj_sl = _apply_gold_manual_sl_override(used_symbol, adj_entry, adj_sl, trade["type"])
-        spread_cost = abs(adj_entry - entry_price)
-        future_prices = df_m1.loc[df_m1.index > trade_time]
-        if future_prices.empty:
-            continue
-        outcome_bar_time = None
-        if trade["type"] == "BUY":
-            sl_dist = adj_entry - adj_sl
-            tp_price = trade.get("tp")
-            if tp_price is None or tp_price <= adj_entry:
-                tp_price = adj_entry + (sl_dist * risk)
-            lock_in_sl = adj_entry + (sl_dist * lock_in_at) if lock_in_enabled else None
-            lock_in_trigger_price = adj_entry + (sl_dist * lock_in_trigger) if lock_in_enabled else None
-            outcome = None
-            outcome_rr = risk
-            lock_in_triggered = False
-            for idx, bar in future_prices.iterrows():
-                if lock_in_enabled and lock_in_trigger_price and lock_in_sl and bar["high"] >= lock_in_trigger_price:
-                    lock_in_triggered = True
-                effective_sl = lock_in_sl if lock_in_triggered else adj_sl
-                if bar["low"] <= effective_sl:
-                    outcome = "LOSS" if effective_sl == adj_sl else "WIN"
-                    outcome_rr = 0.0 if outcome == "LOSS" else lock_in_at
-                    outcome_bar_time = idx
-                    break
-                if bar["high"] >= tp_price:
-                    outcome = "WIN"
-                    outcome_rr = risk
-                    outcome_bar_time = idx
-                    break
-            if outcome == "WIN":
-                profit = _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, "WIN", outcome_rr, spread_cost)
-                total_profit += profit
-                balance += profit
-                wins += 1
-                buys += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "WIN", entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
-            elif outcome == "LOSS":
-                loss = _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, "LOSS", 0, spread_cost)
-                total_loss += loss
-                balance -= loss
-                losses += 1
-                buys += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "LOSS", entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
-                if losing_trades is not None:
-                    losing_trades.append((trade_time, entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
-        elif trade["type"] == "SELL":
-            sl_dist = adj_sl - adj_entry
-            tp_price = trade.get("tp")
-            if tp_price is None or tp_price >= adj_entry:
-                tp_price = adj_entry - (sl_dist * risk)
-            lock_in_sl = adj_entry - (sl_dist * lock_in_at) if lock_in_enabled else None
-            lock_in_trigger_price = adj_entry - (sl_dist * lock_in_trigger) if lock_in_enabled else None
-            outcome = None
-            outcome_rr = risk
-            lock_in_triggered = False
-            for idx, bar in future_prices.iterrows():
-                if lock_in_enabled and lock_in_trigger_price and lock_in_sl and bar["low"] <= lock_in_trigger_price:
-                    lock_in_triggered = True
-                effective_sl = lock_in_sl if lock_in_triggered else adj_sl
-                if bar["high"] >= effective_sl:
-                    outcome = "LOSS" if effective_sl == adj_sl else "WIN"
-                    outcome_rr = 0.0 if outcome == "LOSS" else lock_in_at
-                    outcome_bar_time = idx
-                    break
-                if bar["low"] <= tp_price:
-                    outcome = "WIN"
-                    outcome_rr = risk
-                    outcome_bar_time = idx
-                    break
-            if outcome == "WIN":
-                profit = _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, "WIN", outcome_rr, spread_cost)
-                total_profit += profit
-                balance += profit
-                wins += 1
-                sells += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "WIN", entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
-            elif outcome == "LOSS":
-                loss = _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, "LOSS", 0, spread_cost)
-                total_loss += loss
-                balance -= loss
-                losses += 1
-                sells += 1
-                _update_per_day_session(trade_time, per_day, per_session)
-                if trade_details is not None:
-                    trade_details.append((trade_time, "LOSS", entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
-                if losing_trades is not None:
-                    losing_trades.append((trade_time, entry_price, stop_loss, tp_price, outcome_bar_time, trade.get("reason", "")))
+    m1_index, m1_highs, m1_lows = _bar_arrays(df_m1)
+
+    trades = _resolve_trade_outcomes(
+        signals, used_symbol, m1_index, m1_highs, m1_lows, risk, lock_in_enabled, lock_in_trigger, lock_in_at
+    )
+    for t in trades.itertuples(index=False):
+        pnl = _calc_trade_pnl(used_symbol, balance, risk_pct, t.sl_dist, t.outcome, t.outcome_rr, t.spread_cost)
+        if t.outcome == "WIN":
+            total_profit += pnl
+            balance += pnl
+            wins += 1
+        else:
+            total_loss += pnl
+            balance -= pnl
+            losses += 1
+        if t.type == "BUY":
+            buys += 1
+        else:
+            sells += 1
+        if trade_details is not None:
+            trade_details.append((t.time, t.outcome, t.price, t.sl, t.tp, t.bar_time, t.reason))
+        if losing_trades is not None and t.outcome == "LOSS":
+            losing_trades.append((t.time, t.price, t.sl, t.tp, t.bar_time, t.reason))
+    per_day, per_session = _count_per_day_session(trades["time"])
 
     if return_stats:
         d = _stats_dict(
@@ -287,38 +188,28 @@ def run_vester_backtest(
         print("=" * 60)
         print("TRADE LOG")
         print("=" * 60)
-        per_day = {}
-        per_session = {}
-        for i, t in enumerate(trade_details, 1):
-            trade_time, outcome, entry, sl, tp, bar_time, reason = t[0], t[1], t[2], t[3], t[4], t[5], t[6] if len(t) > 6 else ""
-            bar_str = str(bar_time) if bar_time is not None else "N/A"
-            ts = pd.Timestamp(trade_time) if not hasattr(trade_time, "hour") else trade_time
-            day_str = ts.strftime("%Y-%m-%d") if hasattr(ts, "strftime") else str(ts.date()) if hasattr(ts, "date") else "N/A"
-            hour = ts.hour if ts.tzinfo is None else ts.tz_convert("UTC").hour
-            session = config.TRADE_SESSION_HOURS.get(hour, "other")
-            per_day[day_str] = per_day.get(day_str, 0) + 1
-            per_session[session] = per_session.get(session, 0) + 1
-            print(f"  #{i} {outcome:4} | Day: {day_str} | Session: {session} | Entry: {entry:.4f} | SL: {sl:.4f} | TP: {tp:.4f} | Bar hit: {bar_str}")
-            if reason:
-                print(f"       Reason: {reason[:70]}{'...' if len(reason) > 70 else ''}")
+        log = pd.DataFrame(trade_details, columns=["time", "outcome", "entry", "sl", "tp", "bar_time", "reason"])
+        log["day"], log["session"] = _day_session_labels(log["time"])
+        for i, t in enumerate(log.itertuples(index=False), 1):
+            bar_str = str(t.bar_time) if t.bar_time is not None else "N/A"
+            print(f"  #{i} {t.outcome:4} | Day: {t.day} | Session: {t.session} | Entry: {t.entry:.4f} | SL: {t.sl:.4f} | TP: {t.tp:.4f} | Bar hit: {bar_str}")
+            if t.reason:
+                print(f"       Reason: {t.reason[:70]}{'...' if len(t.reason) > 70 else ''}")
         print()
         if losing_trades:
             print()
             print("=" * 60)
             print("LOSING TRADES (for analysis)")
             print("=" * 60)
-            for i, t in enumerate(losing_trades, 1):
-                trade_time, entry, sl, tp, bar_time, reason = t
-                ts = pd.Timestamp(trade_time) if not hasattr(trade_time, "hour") else trade_time
-                day_str = ts.strftime("%Y-%m-%d") if hasattr(ts, "strftime") else str(ts.date()) if hasattr(ts, "date") else "N/A"
-                hour = ts.hour if ts.tzinfo is None else ts.tz_convert("UTC").hour
-                session = config.TRADE_SESSION_HOURS.get(hour, "other")
-                sl_dist = abs(entry - sl)
-                rr = abs(tp - entry) / sl_dist if sl_dist > 0 else 0
-                print(f"  Loss #{i}: Day: {day_str} | Session: {session} | Entry {trade_time} @ {entry:.4f} | SL: {sl:.4f} | TP: {tp:.4f} | RR: 1:{rr:.1f}")
-                print(f"           SL hit at bar: {bar_time}")
-                if reason:
-                    print(f"           Reason: {reason[:70]}{'...' if len(reason) > 70 else ''}")
+            lost = pd.DataFrame(losing_trades, columns=["time", "entry", "sl", "tp", "bar_time", "reason"])
+            lost["day"], lost["session"] = _day_session_labels(lost["time"])
+            sl_dist = (lost["entry"] - lost["sl"]).abs()
+            lost["rr"] = ((lost["tp"] - lost["entry"]).abs() / sl_dist).where(sl_dist > 0, 0)
+            for i, t in enumerate(lost.itertuples(index=False), 1):
+                print(f"  Loss #{i}: Day: {t.day} | Session: {t.session} | Entry {t.time} @ {t.entry:.4f} | SL: {t.sl:.4f} | TP: {t.tp:.4f} | RR: 1:{t.rr:.1f}")
+                print(f"           SL hit at bar: {t.bar_time}")
+                if t.reason:
+                    print(f"           Reason: {t.reason[:70]}{'...' if len(t.reason) > 70 else ''}")
         print()
 
 
@@ -1,16 +1,72 @@
 """Shared utilities for backtest runners."""
+import functools
+
+import numpy as np
 import pandas as pd
 import config
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _strip_tz(df, localize=False):
+    """
+    Return df with a tz-naive (UTC) index; localize=True keeps the local wall time instead (follow runner).
+    Shallow copy: only the index is replaced, the OHLC columns are shared with the caller's frame,
+    which is left untouched. Callers must use the result.
+    """
+    if df is None or df.empty or getattr(df.index, "tz", None) is None:
+        return df
+    df = df.copy(deep=False)
+    df.index = df.index.tz_localize(None) if localize else df.index.tz_convert(None)
+    return df
+
+
+_OHLC_AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+_RESAMPLE_CACHE = {}
+_RESAMPLE_CACHE_MAX = 16
+
 
-def _update_per_day_session(trade_time, per_day, per_session):
-    """Update per_day and per_session dicts from trade_time."""
-    ts = pd.Timestamp(trade_time) if not hasattr(trade_time, "strftime") else trade_time
-    day_str = ts.strftime("%Y-%m-%d") if hasattr(ts, "strftime") else str(ts.date()) if hasattr(ts, "date") else "N/A"
-    hour = ts.hour if ts.tzinfo is None else ts.tz_convert("UTC").hour if ts.tzinfo else ts.hour
-    session = config.TRADE_SESSION_HOURS.get(hour, "other")
-    per_day[day_str] = per_day.get(day_str, 0) + 1
-    per_session[session] = per_session.get(session, 0) + 1
+def _resample_cached(df, rule):
+    """
+    df.resample(rule) to OHLCV bars (dropna), memoised per (frame, rule) so parameter sweeps and
+    walk-forward re-runs on the same H1 frame skip the resample. Keyed on id + length + first/last
+    index; the source frame is held in the cache so its id cannot be reused while the entry lives.
+    Callers must not modify the returned frame (strategies copy their inputs).
+    """
+    key = (id(df), rule, len(df), df.index[0] if len(df) else None, df.index[-1] if len(df) else None)
+    hit = _RESAMPLE_CACHE.get(key)
+    if hit is not None and hit[0] is df:
+        return hit[1]
+    out = df.resample(rule).agg(_OHLC_AGG).dropna()
+    if len(_RESAMPLE_CACHE) >= _RESAMPLE_CACHE_MAX:
+        _RESAMPLE_CACHE.clear()
+    _RESAMPLE_CACHE[key] = (df, out)
+    return out
+
+
+def _day_session_labels(times):
+    """
+    Vectorized day ("%Y-%m-%d") and session labels for trade times.
+    Session hour is taken in UTC for tz-aware times (TRADE_SESSION_HOURS); unknown hours -> "other".
+    Returns (day, session) Series aligned with times.
+    """
+    ts = pd.to_datetime(pd.Series(times).reset_index(drop=True))
+    hours = ts.dt.tz_convert("UTC").dt.hour if ts.dt.tz is not None else ts.dt.hour
+    day = ts.dt.strftime("%Y-%m-%d")
+    session = hours.map(config.TRADE_SESSION_HOURS).fillna("other")
+    return day, session
+
+
+def _count_per_day_session(times):
+    """Return (per_day, per_session) trade counts for the given trade times."""
+    if len(times) == 0:
+        return {}, {}
+    day, session = _day_session_labels(times)
+    return day.value_counts().to_dict(), session.value_counts().to_dict()
 
 
 def get_pip_size_for_symbol(symbol):
@@ -41,6 +97,35 @@ def _use_gold_fixed_sl(symbol):
     return is_gold and sl_pts > 0
 
 
+@functools.lru_cache(maxsize=64)
+def _realism_constants(symbol):
+    """(spread_pips, slippage_pips, commission_per_lot, pip_size) for symbol, looked up once per run."""
+    spread_pips = config.get_symbol_config(symbol, 'BACKTEST_SPREAD_PIPS') or getattr(config, 'BACKTEST_SPREAD_PIPS', 0.0)
+    slippage_pips = config.get_symbol_config(symbol, 'BACKTEST_SLIPPAGE_PIPS') or getattr(config, 'BACKTEST_SLIPPAGE_PIPS', 0.0)
+    commission_per_lot = getattr(config, 'BACKTEST_COMMISSION_PER_LOT', 0.0)
+    return spread_pips, slippage_pips, commission_per_lot, get_pip_size_for_symbol(symbol)
+
+
+@functools.lru_cache(maxsize=64)
+def _pnl_constants(symbol):
+    """(use_manual_lot, lot, loss_per_lot, commission_per_lot) used by _calc_trade_pnl."""
+    commission_per_lot = getattr(config, 'BACKTEST_COMMISSION_PER_LOT', 0.0)
+    if not _use_manual_lot_for_backtest(symbol):
+        return False, 0.01, None, commission_per_lot
+    lot = getattr(config, 'MAX_POSITION_SIZE', 0.01)
+    loss_per_lot = config.get_symbol_config(symbol, 'LOSS_PER_LOT_PER_POINT') or 100
+    return True, lot, loss_per_lot, commission_per_lot
+
+
+def _clear_symbol_caches():
+    """
+    Drop the cached _realism_constants/_pnl_constants tuples. Each run_*_backtest calls this first, so a
+    run sees config as it is when the run starts (sweeps override config between runs).
+    """
+    for fn in (_realism_constants, _pnl_constants):
+        fn.cache_clear()
+
+
 def _apply_gold_manual_sl_override(used_symbol, adj_entry, adj_sl, order_type):
     """When gold and GOLD_MANUAL_SL_POINTS set, override SL to fixed distance (50 pips = 5 points)."""
     if not _use_gold_fixed_sl(used_symbol):
@@ -57,11 +142,8 @@ def _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, outcome, outcome_rr
     Gold + GOLD_USE_MANUAL_LOT: use MAX_POSITION_SIZE and LOSS_PER_LOT_PER_POINT.
     Else: use risk-based (balance * risk_pct).
     """
-    commission_per_lot = getattr(config, 'BACKTEST_COMMISSION_PER_LOT', 0.0)
-    use_manual = _use_manual_lot_for_backtest(used_symbol)
+    use_manual, lot, loss_per_lot, commission_per_lot = _pnl_constants(used_symbol)
     if use_manual:
-        lot = getattr(config, 'MAX_POSITION_SIZE', 0.01)
-        loss_per_lot = config.get_symbol_config(used_symbol, 'LOSS_PER_LOT_PER_POINT') or 100
         commission = commission_per_lot * lot if commission_per_lot else 0.0
         if outcome == "WIN":
             return sl_dist * outcome_rr * lot * loss_per_lot - spread_cost - commission
@@ -72,32 +154,253 @@ def _calc_trade_pnl(used_symbol, balance, risk_pct, sl_dist, outcome, outcome_rr
     return (balance * risk_pct) + spread_cost + commission
 
 
-def _apply_backtest_realism(entry_price, stop_loss, order_type, symbol, bar_close=None):
-    """Apply spread, slippage to entry/SL. Returns (adj_entry, adj_sl, commission)."""
-    spread_pips = config.get_symbol_config(symbol, 'BACKTEST_SPREAD_PIPS') or getattr(config, 'BACKTEST_SPREAD_PIPS', 0.0)
-    slippage_pips = config.get_symbol_config(symbol, 'BACKTEST_SLIPPAGE_PIPS') or getattr(config, 'BACKTEST_SLIPPAGE_PIPS', 0.0)
-    commission_per_lot = getattr(config, 'BACKTEST_COMMISSION_PER_LOT', 0.0)
-    pip_size = get_pip_size_for_symbol(symbol)
+def _apply_backtest_realism_vec(entry_prices, stop_losses, order_types, symbol, bar_closes=None):
+    """
+    Vectorized _apply_backtest_realism: spread on entry, slippage on SL for whole arrays.
+    Symbol constants are looked up once. Returns (adj_entry, adj_sl, commission) as NumPy arrays.
+    """
+    spread_pips, slippage_pips, commission_per_lot, pip_size = _realism_constants(symbol)
     default_lot = 0.01
-    commission = commission_per_lot * default_lot if commission_per_lot else 0.0
-    close = bar_close if bar_close is not None else entry_price
-    adj_entry = entry_price
+    entry_prices = np.asarray(entry_prices, dtype=float)
+    stop_losses = np.asarray(stop_losses, dtype=float)
+    is_buy = _side_mask(order_types, 'BUY')
+    commission = np.full(entry_prices.shape, commission_per_lot * default_lot if commission_per_lot else 0.0)
+    closes = entry_prices if bar_closes is None else np.asarray(bar_closes, dtype=float)
+    adj_entry = entry_prices
     if spread_pips > 0:
         half_spread = (spread_pips / 2.0) * pip_size
-        if order_type == 'BUY':
-            adj_entry = close + half_spread
-        else:
-            adj_entry = close - half_spread
-    adj_sl = stop_loss
+        adj_entry = np.where(is_buy, closes + half_spread, closes - half_spread)
+    adj_sl = stop_losses
     if slippage_pips > 0:
         slip = slippage_pips * pip_size
-        if order_type == 'BUY':
-            adj_sl = stop_loss - slip
-        else:
-            adj_sl = stop_loss + slip
+        adj_sl = np.where(is_buy, stop_losses - slip, stop_losses + slip)
     return adj_entry, adj_sl, commission
 
 
+def _apply_backtest_realism(entry_price, stop_loss, order_type, symbol, bar_close=None):
+    """Apply spread, slippage to entry/SL. Returns (adj_entry, adj_sl, commission)."""
+    adj_entry, adj_sl, commission = _apply_backtest_realism_vec(
+        [entry_price], [stop_loss], [order_type], symbol, None if bar_close is None else [bar_close]
+    )
+    return float(adj_entry[0]), float(adj_sl[0]), float(commission[0])
+
+
+SIGNAL_TYPE_DTYPE = pd.CategoricalDtype(["BUY", "SELL"])
+
+
+def _side_mask(types, side):
+    """Boolean mask of types == side; Categorical columns compare their int8 codes instead of strings."""
+    if isinstance(getattr(types, "dtype", None), pd.CategoricalDtype):
+        if side not in types.cat.categories:
+            return np.zeros(len(types), dtype=bool)
+        return types.cat.codes.to_numpy() == types.cat.categories.get_loc(side)
+    return np.asarray(types) == side
+
+
+def _coerce_signal_dtypes(signals):
+    """
+    Normalize a strategy's signals once after run_backtest(): price/sl/tp to float64 (bad values -> NaN),
+    type to a BUY/SELL Categorical (anything else -> NaN) and time to datetime64, so the validity
+    filter and the batch scan are pure NumPy.
+    """
+    if signals is None or signals.empty:
+        return signals
+    for col in ("price", "sl", "tp"):
+        if col in signals.columns:
+            signals[col] = pd.to_numeric(signals[col], errors="coerce").astype(np.float64)
+    if "type" in signals.columns:
+        signals["type"] = signals["type"].astype(SIGNAL_TYPE_DTYPE)
+    if "time" in signals.columns:
+        signals["time"] = pd.to_datetime(signals["time"])
+    return signals
+
+
+def _valid_sl_mask(signals):
+    """
+    Boolean mask of signals with a usable SL: price and sl present, BUY sl below price, SELL sl above price.
+    Expects signals passed through _coerce_signal_dtypes (NaN marks missing/non-numeric values).
+    """
+    price = signals["price"].to_numpy(dtype=float)
+    sl = signals["sl"].to_numpy(dtype=float)
+    is_buy = _side_mask(signals["type"], "BUY")
+    is_sell = _side_mask(signals["type"], "SELL")
+    valid = ~np.isnan(price) & ~np.isnan(sl)
+    valid &= ~(is_buy & (sl >= price))
+    valid &= ~(is_sell & (sl <= price))
+    return valid
+
+
+# Outcome codes returned by _first_hit: 0 = SL hit, 1 = TP hit, 2 = lock-in SL hit, -1 = nothing hit.
+# side is +1.0 for BUY, -1.0 for SELL: multiplying prices by side turns every SELL test into the BUY one.
+def _first_hit_py(highs, lows, start, side, sl, tp, use_lock, lock_in_sl, lock_in_trigger):
+    """
+    Early-exit scan from bar `start` for the first SL/TP hit (SL checked before TP).
+    Once the lock-in trigger is reached the SL moves to lock_in_sl from that bar on.
+    Returns (bar_pos, code); (-1, -1) if nothing hit. Compiled with numba when available.
+    """
+    locked = False
+    for i in range(start, highs.shape[0]):
+        favourable = highs[i] if side > 0 else lows[i]
+        adverse = lows[i] if side > 0 else highs[i]
+        if use_lock and not locked:
+            locked = side * favourable >= side * lock_in_trigger
+        cur_sl = lock_in_sl if locked else sl
+        if side * adverse <= side * cur_sl:
+            return i, 2 if locked else 0
+        if side * favourable >= side * tp:
+            return i, 1
+    return -1, -1
+
+
+def _first_hit_np(highs, lows, start, side, sl, tp, use_lock, lock_in_sl, lock_in_trigger):
+    """Vectorized NumPy equivalent of _first_hit_py (used when numba is not installed)."""
+    favourable = side * (highs[start:] if side > 0 else lows[start:])
+    adverse = side * (lows[start:] if side > 0 else highs[start:])
+    n = len(favourable)
+    sl_hit = adverse <= side * sl
+    tp_hit = favourable >= side * tp
+    trigger_pos = n
+    if use_lock:
+        hits = np.flatnonzero(favourable >= side * lock_in_trigger)
+        if hits.size:
+            trigger_pos = int(hits[0])
+    hits = np.flatnonzero((sl_hit | tp_hit)[:trigger_pos])
+    if hits.size:
+        pos = int(hits[0])
+        return start + pos, 0 if sl_hit[pos] else 1
+    if trigger_pos < n:
+        lock_hit = adverse[trigger_pos:] <= side * lock_in_sl
+        hits = np.flatnonzero(lock_hit | tp_hit[trigger_pos:])
+        if hits.size:
+            pos = int(hits[0])
+            return start + trigger_pos + pos, 2 if lock_hit[pos] else 1
+    return -1, -1
+
+
+def _first_hit_batch_py(highs, lows, starts, sides, sls, tps, use_lock, lock_in_sls, lock_in_triggers):
+    """Run _first_hit for many trades; parallel over trades when compiled with numba."""
+    n = starts.shape[0]
+    positions = np.full(n, -1, dtype=np.int64)
+    codes = np.full(n, -1, dtype=np.int64)
+    for k in prange(n):
+        pos, code = _first_hit(
+            highs, lows, starts[k], sides[k], sls[k], tps[k],
+            use_lock[k], lock_in_sls[k], lock_in_triggers[k],
+        )
+        positions[k] = pos
+        codes[k] = code
+    return positions, codes
+
+
+_HAVE_NUMBA = njit is not None
+if _HAVE_NUMBA:
+    _first_hit = njit(cache=True)(_first_hit_py)
+    _first_hit_batch = njit(cache=True, parallel=True)(_first_hit_batch_py)
+else:
+    _first_hit = _first_hit_np
+    _first_hit_batch = _first_hit_batch_py
+
+
+def _scan_outcome(highs, lows, is_buy, adj_sl, tp_price, lock_in_sl, lock_in_trigger_price, lock_in_at, risk):
+    """
+    Find the first bar that closes the trade (same rules as the old per-bar loop, SL checked before TP).
+    highs/lows: NumPy arrays of the bars after entry. Lock-in: once price reaches lock_in_trigger_price,
+    the SL moves to lock_in_sl from that bar on. Returns (bar_pos, outcome, outcome_rr); (None, None, risk) if nothing hit.
+    """
+    use_lock = bool(lock_in_trigger_price and lock_in_sl)
+    pos, code = _first_hit(
+        highs, lows, 0, 1.0 if is_buy else -1.0, float(adj_sl), float(tp_price), use_lock,
+        float(lock_in_sl) if use_lock else 0.0, float(lock_in_trigger_price) if use_lock else 0.0,
+    )
+    return _decode_outcome(pos, code, adj_sl, lock_in_sl, lock_in_at, risk)
+
+
+def _decode_outcome(pos, code, adj_sl, lock_in_sl, lock_in_at, risk):
+    """Map a _first_hit (bar_pos, code) pair to (bar_pos, outcome, outcome_rr) like _scan_outcome."""
+    if code < 0:
+        return None, None, risk
+    pos = int(pos)
+    if code == 0:
+        return pos, "LOSS", 0.0
+    if code == 1:
+        return pos, "WIN", risk
+    if lock_in_sl == adj_sl:
+        return pos, "LOSS", 0.0
+    return pos, "WIN", lock_in_at
+
+
+def _bar_arrays(df):
+    """
+    Sorted bar index plus C-contiguous float64 high/low arrays, extracted once per run so the
+    outcome scan never touches the DataFrame. Returns (index, highs, lows).
+    """
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+    highs = np.ascontiguousarray(df["high"].to_numpy(dtype=np.float64))
+    lows = np.ascontiguousarray(df["low"].to_numpy(dtype=np.float64))
+    return df.index, highs, lows
+
+
+def _resolve_trade_outcomes(signals, symbol, bar_index, highs, lows, risk, lock_in_enabled, lock_in_trigger, lock_in_at):
+    """
+    Batch version of the per-trade loop: apply realism, TP/lock-in levels and the SL/TP scan to every
+    BUY/SELL signal at once. bar_index/highs/lows: sorted bars used to walk each trade forward.
+    Returns a DataFrame (signal order) of closed trades only with columns time, type, price, sl, tp,
+    reason, sl_dist, spread_cost, outcome, outcome_rr, bar_time. Balance compounding stays with the caller.
+    """
+    trades = signals[signals["type"].isin(("BUY", "SELL"))]
+    starts = bar_index.searchsorted(trades["time"], side="right")
+    keep = starts < len(bar_index)
+    trades = trades[keep]
+    starts = starts[keep].astype(np.int64)
+    is_buy = _side_mask(trades["type"], "BUY")
+    price = trades["price"].to_numpy(dtype=float)
+    sl = trades["sl"].to_numpy(dtype=float)
+    adj_entry, adj_sl, _ = _apply_backtest_realism_vec(price, sl, trades["type"], symbol, price)
+    sign = np.where(is_buy, 1.0, -1.0)
+    if _use_gold_fixed_sl(symbol):
+        adj_sl = adj_entry - sign * getattr(config, 'GOLD_MANUAL_SL_POINTS', 5.0)
+    sl_dist = sign * (adj_entry - adj_sl)
+    if "tp" in trades.columns:
+        tp = trades["tp"].to_numpy(dtype=float)
+    else:
+        tp = np.full(len(trades), np.nan)
+    # Missing TP or TP on the wrong side of entry -> default RR target
+    bad_tp = np.isnan(tp) | (sign * (tp - adj_entry) <= 0)
+    tp = np.where(bad_tp, adj_entry + sign * sl_dist * risk, tp)
+    if lock_in_enabled:
+        lock_in_sls = adj_entry + sign * sl_dist * lock_in_at
+        lock_in_triggers = adj_entry + sign * sl_dist * lock_in_trigger
+        use_lock = (lock_in_sls != 0) & (lock_in_triggers != 0)
+    else:
+        lock_in_sls = np.zeros(len(trades))
+        lock_in_triggers = np.zeros(len(trades))
+        use_lock = np.zeros(len(trades), dtype=bool)
+    positions, codes = _first_hit_batch(
+        np.ascontiguousarray(highs, dtype=np.float64), np.ascontiguousarray(lows, dtype=np.float64), starts, sign,
+        adj_sl, tp, use_lock, lock_in_sls, lock_in_triggers,
+    )
+    locked_win = (codes == 2) & (lock_in_sls != adj_sl)
+    closed = codes >= 0
+    win = (codes == 1) | locked_win
+    outcome_rr = np.where(codes == 1, float(risk), np.where(locked_win, float(lock_in_at), 0.0))
+    reason = trades["reason"].to_numpy() if "reason" in trades.columns else np.full(len(trades), "", dtype=object)
+    result = pd.DataFrame({
+        "time": trades["time"].to_numpy(),
+        "type": np.where(is_buy, "BUY", "SELL"),
+        "price": price,
+        "sl": sl,
+        "tp": tp,
+        "reason": reason,
+        "sl_dist": sl_dist,
+        "spread_cost": np.abs(adj_entry - price),
+        "outcome": np.where(win, "WIN", "LOSS"),
+        "outcome_rr": outcome_rr,
+        "bar_time": bar_index[np.where(closed, positions, 0)],
+    })
+    return result[closed].reset_index(drop=True)
+
+
 def _stats_dict(strategy, trades, wins, losses, total_profit, total_loss, final_balance):
     """Build a result dict for summary tables (used by all strategy runners)."""
     initial = config.INITIAL_BALANCE
@@ -1,15 +1,74 @@
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import yfinance as yf
 import pandas as pd
 import os
+from datetime import date
+import config
+
+try:
+    import pyarrow  # noqa: F401  (multithreaded CSV parser for pd.read_csv)
+    _CSV_ENGINE = 'pyarrow'
+except ImportError:
+    _CSV_ENGINE = None
 
 # Retry config for Yahoo Finance (handles transient None/timeouts)
 YF_MAX_RETRIES = 3
 YF_RETRY_DELAY_SEC = 3
 
+# On-disk cache for Yahoo Finance fetches: one file per (symbol, period, interval) for the current date.
+# Daily-or-longer bars are kept for the whole day; intraday bars only with config.YF_CACHE_INTRADAY,
+# and for at most YF_CACHE_INTRADAY_TTL_SEC. Files from earlier dates are removed on the next write.
+YF_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'yf')
+YF_CACHE_INTRADAY_TTL_SEC = 3600
+YF_DAILY_INTERVALS = ('1d', '5d', '1wk', '1mo', '3mo')
+
+
+def _yf_cache_path(symbol, period, interval):
+    safe_symbol = ''.join(c if c.isalnum() else '_' for c in symbol)
+    return os.path.join(YF_CACHE_DIR, safe_symbol, f"{interval}_{period}_{date.today().isoformat()}.pkl")
+
+
+def _yf_cache_get(path, interval):
+    """Cached frame at path, or None if missing, expired (intraday only) or unreadable."""
+    try:
+        if interval not in YF_DAILY_INTERVALS and os.path.getmtime(path) < time.time() - YF_CACHE_INTRADAY_TTL_SEC:
+            return None
+        return pd.read_pickle(path)
+    except Exception:
+        return None
 
-def fetch_data_yfinance(symbol, period='5d', interval='5m'):
-    """Fetches historical data from Yahoo Finance with retries on transient failures."""
+
+def _yf_cache_put(path, df):
+    """Write df to path and drop this symbol's cache files from earlier dates."""
+    try:
+        folder = os.path.dirname(path)
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        df.to_pickle(tmp)
+        os.replace(tmp, path)
+        today = f"_{date.today().isoformat()}.pkl"
+        for name in os.listdir(folder):
+            if today not in name:
+                os.remove(os.path.join(folder, name))
+    except OSError:
+        pass
+
+
+def fetch_data_yfinance(symbol, period='5d', interval='5m', use_cache=None):
+    """
+    Fetches historical data from Yahoo Finance with retries on transient failures.
+    With use_cache, identical requests on the same day are served from YF_CACHE_DIR. The default (None)
+    caches daily-or-longer intervals, and intraday ones only when config.YF_CACHE_INTRADAY is set.
+    """
+    if use_cache is None:
+        use_cache = interval in YF_DAILY_INTERVALS or getattr(config, 'YF_CACHE_INTRADAY', False)
+    cache_path = _yf_cache_path(symbol, period, interval) if use_cache else None
+    if cache_path is not None:
+        cached = _yf_cache_get(cache_path, interval)
+        if cached is not None:
+            print(f"Using cached {period} of {symbol} at {interval} interval.")
+            return cached
     print(f"Fetching {period} of data for {symbol} at {interval} interval...")
     last_error = None
     for attempt in range(1, YF_MAX_RETRIES + 1):
@@ -41,17 +100,47 @@ def fetch_data_yfinance(symbol, period='5d', interval='5m'):
         'Volume': 'volume'
     })
     df = df[['open', 'high', 'low', 'close', 'volume']].dropna()
+    if cache_path is not None:
+        _yf_cache_put(cache_path, df)
     return df
 
+def fetch_data_yfinance_batch(symbols, period='5d', interval='5m', max_workers=8):
+    """
+    Fetches several symbols concurrently (one thread per request; HTTP waits release the GIL).
+    Each symbol goes through fetch_data_yfinance, retries included.
+    Returns (frames, failures): {symbol: DataFrame} and {symbol: exception} for symbols that failed.
+    """
+    frames, failures = {}, {}
+    symbols = list(dict.fromkeys(symbols))
+    if not symbols:
+        return frames, failures
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(symbols)))) as ex:
+        futures = {ex.submit(fetch_data_yfinance, s, period, interval): s for s in symbols}
+        for fut in as_completed(futures):
+            symbol = futures[fut]
+            try:
+                frames[symbol] = fut.result()
+            except Exception as e:
+                failures[symbol] = e
+    return frames, failures
+
 def fetch_daily_data_yfinance(symbol, period='1mo'):
     """Fetches daily data for PDH/PDL calculation."""
     return fetch_data_yfinance(symbol, period=period, interval='1d')
 
 def load_data_csv(filepath):
-    """Loads data from a CSV file."""
+    """Loads data from a CSV file (pyarrow CSV engine when installed, else pandas' C parser)."""
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"CSV file not found: {filepath}")
-    df = pd.read_csv(filepath)
+    df = None
+    if _CSV_ENGINE:
+        try:
+            df = pd.read_csv(filepath, engine=_CSV_ENGINE)
+        except ValueError:
+            # pyarrow rejects some files the C parser handles (ragged rows, odd quoting)
+            df = None
+    if df is None:
+        df = pd.read_csv(filepath)
     df.columns = [c.lower() for c in df.columns]
     if 'time' in df.columns:
         df['time'] = pd.to_datetime(df['time'])
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 from typing import Optional
 
@@ -13,7 +14,15 @@ def calculate_pdl_pdh(daily_df, current_date):
     if not isinstance(daily_df.index, pd.DatetimeIndex):
         daily_df.index = pd.to_datetime(daily_df.index)
 
-    mask = daily_df.index < current_date.normalize()
+    cutoff = current_date.normalize()
+    if daily_df.index.is_monotonic_increasing:
+        # Sorted daily index (the normal case, called once per bar): binary search instead of a full mask
+        pos = daily_df.index.searchsorted(cutoff, side='left')
+        if pos == 0:
+            return None, None
+        return daily_df['high'].iat[pos - 1], daily_df['low'].iat[pos - 1]
+
+    mask = daily_df.index < cutoff
     past_data = daily_df.loc[mask]
 
     if past_data.empty:
@@ -22,44 +31,69 @@ def calculate_pdl_pdh(daily_df, current_date):
     prev_day = past_data.iloc[-1]
     return prev_day['high'], prev_day['low']
 
+def _shifted(values, periods):
+    """Array equivalent of Series.shift(periods) for periods >= 0 (NaN-padded)."""
+    out = np.full(len(values), np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
+
+def _fvg_masks(high, low):
+    """Bull/bear FVG masks: gap between bar i and bar i-2."""
+    return low > _shifted(high, 2), high < _shifted(low, 2)
+
+def _rejection_masks(open_, high, low, close, wick_ratio):
+    """Bull/bear pin-bar masks (wick / range > wick_ratio). fmin/fmax skip NaN like DataFrame.min(axis=1)."""
+    rng = high - low
+    rng[rng == 0] = 1e-10  # avoid div by zero
+    lower_wick = np.fmin(open_, close) - low
+    upper_wick = high - np.fmax(open_, close)
+    return (lower_wick / rng > wick_ratio) & (close > open_), (upper_wick / rng > wick_ratio) & (close < open_)
+
+def _displacement_masks(open_, close, threshold, window):
+    """Bull/bear displacement masks: body > threshold x mean body of the window ending at the bar."""
+    body = np.abs(close - open_)
+    avg_body = np.full(len(body), np.nan)
+    if 0 < window <= len(body):
+        # NaN anywhere in the window yields NaN, as rolling().mean() does
+        avg_body[window - 1:] = np.lib.stride_tricks.sliding_window_view(body, window).mean(axis=1)
+    is_large = body > avg_body * threshold
+    return is_large & (close > open_), is_large & (close < open_)
+
 def detect_fvg(df, lookback=3):
     """Adds is_fvg_bullish and is_fvg_bearish columns. ICT FVG."""
-    df['fvg_bull'] = False
-    df['fvg_bear'] = False
-    c1_high = df['high'].shift(2)
-    c1_low = df['low'].shift(2)
-    c3_high = df['high']
-    c3_low = df['low']
-    df.loc[(c3_low > c1_high), 'fvg_bull'] = True
-    df.loc[(c3_high < c1_low), 'fvg_bear'] = True
+    df['fvg_bull'], df['fvg_bear'] = _fvg_masks(df['high'].to_numpy(dtype=float), df['low'].to_numpy(dtype=float))
     return df
 
 def detect_order_block(df):
     """Adds is_ob_bull and is_ob_bear columns."""
-    df['ob_bull'] = False
-    df['ob_bear'] = False
-    prev_open = df['open'].shift(1)
-    prev_close = df['close'].shift(1)
-    curr_open = df['open']
-    curr_close = df['close']
+    curr_open = df['open'].to_numpy(dtype=float)
+    curr_close = df['close'].to_numpy(dtype=float)
+    prev_open = _shifted(curr_open, 1)
+    prev_close = _shifted(curr_close, 1)
     is_prev_red = prev_close < prev_open
     is_curr_green = curr_close > curr_open
     is_engulfing_bull = (curr_close > prev_open) & (curr_open < prev_close)
-    df.loc[is_prev_red & is_curr_green & is_engulfing_bull, 'ob_bull'] = True
+    df['ob_bull'] = is_prev_red & is_curr_green & is_engulfing_bull
     is_prev_green = prev_close > prev_open
     is_curr_red = curr_close < curr_open
     is_engulfing_bear = (curr_close < prev_open) & (curr_open > prev_close)
-    df.loc[is_prev_green & is_curr_red & is_engulfing_bear, 'ob_bear'] = True
+    df['ob_bear'] = is_prev_green & is_curr_red & is_engulfing_bear
     return df
 
 def detect_liquidity_sweep(df, lookback=5):
     """Detects if the current candle swept a high/low from the last lookback candles."""
-    df['sweep_high'] = False
-    df['sweep_low'] = False
-    recent_high = df['high'].shift(1).rolling(window=lookback).max()
-    recent_low = df['low'].shift(1).rolling(window=lookback).min()
-    df.loc[(df['high'] > recent_high) & (df['close'] < recent_high), 'sweep_high'] = True
-    df.loc[(df['low'] < recent_low) & (df['close'] > recent_low), 'sweep_low'] = True
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
+    close = df['close'].to_numpy(dtype=float)
+    recent_high = np.full(len(df), np.nan)
+    recent_low = np.full(len(df), np.nan)
+    if 0 < lookback < len(df):
+        # Window over the previous lookback bars; NaN anywhere in it yields NaN, as rolling() does
+        recent_high[lookback:] = np.lib.stride_tricks.sliding_window_view(high[:-1], lookback).max(axis=1)
+        recent_low[lookback:] = np.lib.stride_tricks.sliding_window_view(low[:-1], lookback).min(axis=1)
+    df['sweep_high'] = (high > recent_high) & (close < recent_high)
+    df['sweep_low'] = (low < recent_low) & (close > recent_low)
     return df
 
 def calculate_ema(df, period=200):
@@ -69,14 +103,28 @@ def calculate_ema(df, period=200):
 
 def detect_rejection_candle(df, wick_ratio=0.55):
     """Adds rejection_bull (pin bar with long lower wick) and rejection_bear (long upper wick)."""
-    df['rejection_bull'] = False
-    df['rejection_bear'] = False
-    rng = df['high'] - df['low']
-    rng = rng.replace(0, 1e-10)  # avoid div by zero
-    lower_wick = df[['open', 'close']].min(axis=1) - df['low']
-    upper_wick = df['high'] - df[['open', 'close']].max(axis=1)
-    df.loc[(lower_wick / rng > wick_ratio) & (df['close'] > df['open']), 'rejection_bull'] = True
-    df.loc[(upper_wick / rng > wick_ratio) & (df['close'] < df['open']), 'rejection_bear'] = True
+    df['rejection_bull'], df['rejection_bear'] = _rejection_masks(
+        df['open'].to_numpy(dtype=float), df['high'].to_numpy(dtype=float),
+        df['low'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float), wick_ratio,
+    )
+    return df
+
+
+def detect_candle_patterns(df, wick_ratio=0.55, displacement_threshold=1.5, displacement_window=10):
+    """
+    detect_fvg + detect_rejection_candle + detect_displacement in one pass: OHLC is read into arrays
+    once and the six flag columns are written in the same order the three calls would add them.
+    Writes into df (like detect_fvg) instead of returning a copy.
+    """
+    open_ = df['open'].to_numpy(dtype=float)
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
+    close = df['close'].to_numpy(dtype=float)
+    df['fvg_bull'], df['fvg_bear'] = _fvg_masks(high, low)
+    df['rejection_bull'], df['rejection_bear'] = _rejection_masks(open_, high, low, close, wick_ratio)
+    df['displacement_bull'], df['displacement_bear'] = _displacement_masks(
+        open_, close, displacement_threshold, displacement_window
+    )
     return df
 
 
@@ -106,16 +154,8 @@ def get_equilibrium_from_daily(daily_df: pd.DataFrame, current_date) -> Optional
 
 
 def detect_displacement(df, threshold=1.5, window=10):
-    """Detects displacement: body > average of previous N candles (default 10 per spec)."""
-    df = df.copy()
-    df['displacement_bull'] = False
-    df['displacement_bear'] = False
-    df['body_size'] = abs(df['close'] - df['open'])
-    df['avg_body'] = df['body_size'].rolling(window=window).mean()
-    is_green = df['close'] > df['open']
-    is_large_bull = df['body_size'] > (df['avg_body'] * threshold)
-    df.loc[is_green & is_large_bull, 'displacement_bull'] = True
-    is_red = df['close'] < df['open']
-    is_large_bear = df['body_size'] > (df['avg_body'] * threshold)
-    df.loc[is_red & is_large_bear, 'displacement_bear'] = True
+    """Detects displacement: body > average of previous N candles (default 10 per spec). Writes into df like the other detectors."""
+    df['displacement_bull'], df['displacement_bear'] = _displacement_masks(
+        df['open'].to_numpy(dtype=float), df['close'].to_numpy(dtype=float), threshold, window
+    )
     return df
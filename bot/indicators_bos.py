@@ -6,6 +6,22 @@ try:
 except ImportError:
     config = None
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+# bos_direction is stored as a categorical: one int8 code per bar (-1 = no BOS) instead of Python strings.
+# Reads still give 'BULLISH' / 'BEARISH' / NaN, so pd.isna and string comparisons keep working.
+BOS_DIRECTION_DTYPE = pd.CategoricalDtype(['BULLISH', 'BEARISH'])
+
+
+def _bos_direction_column(bull, bear, index):
+    """bos_direction Series from the bull/bear break masks (a bearish break wins if both fire on one bar)."""
+    codes = np.where(bear, 1, np.where(bull, 0, -1)).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codes, dtype=BOS_DIRECTION_DTYPE), index=index)
+
 
 def detect_swing_highs_lows(df, swing_length=3):
     """Detects swing highs and lows. Dispatches to LuxAlgo or Kingsley per config."""
@@ -15,44 +31,54 @@ def detect_swing_highs_lows(df, swing_length=3):
     return _detect_swing_fractal(df, swing_length)
 
 
+def _neighbour_extremes(values, length, ufunc):
+    """
+    For each bar i, the extreme (ufunc = np.fmax / np.fmin) of the `length` bars before and after it.
+    Bars without a full window on both sides get NaN (never a swing). NaN neighbours are skipped, as in
+    the original loop where a NaN neighbour never compared >= / <=; an all-NaN side gives -inf / +inf.
+
+    swing_length is a small constant (3 or 5), so the window is unrolled into `length` whole-array
+    ufunc passes over shifted slices instead of reducing a (n, length) sliding-window view row by row.
+    """
+    n = len(values)
+    if length == 0:
+        # No neighbours to beat: every bar qualifies, as in the original per-bar loop
+        empty = np.full(n, -np.inf if ufunc is np.fmax else np.inf)
+        return empty, empty
+    left = np.full(n, np.nan)
+    right = np.full(n, np.nan)
+    if length >= 1 and n >= 2 * length + 1:
+        m = n - 2 * length
+        left_ext = values[length - 1:length - 1 + m].copy()
+        right_ext = values[length + 1:length + 1 + m].copy()
+        for j in range(2, length + 1):
+            ufunc(left_ext, values[length - j:length - j + m], out=left_ext)
+            ufunc(right_ext, values[length + j:length + j + m], out=right_ext)
+        fill = -np.inf if ufunc is np.fmax else np.inf
+        left[length:n - length] = np.where(np.isnan(left_ext), fill, left_ext)
+        right[length:n - length] = np.where(np.isnan(right_ext), fill, right_ext)
+    return left, right
+
+
+def _fractal_swings(highs, lows, swing_length):
+    """Swing high / swing low masks for the fractal rule on raw high/low arrays."""
+    left_high, right_high = _neighbour_extremes(highs, swing_length, np.fmax)
+    left_low, right_low = _neighbour_extremes(lows, swing_length, np.fmin)
+    return (highs > left_high) & (highs > right_high), (lows < left_low) & (lows < right_low)
+
+
 def _detect_swing_fractal(df, swing_length=3):
-    """Detects swing highs and swing lows using fractal logic (Kingsley)."""
-    df['swing_high'] = False
-    df['swing_low'] = False
-    df['swing_high_price'] = np.nan
-    df['swing_low_price'] = np.nan
-
-    for i in range(swing_length, len(df) - swing_length):
-        is_swing_high = True
-        center_high = df.iloc[i]['high']
-        for j in range(1, swing_length + 1):
-            if df.iloc[i - j]['high'] >= center_high:
-                is_swing_high = False
-                break
-        if is_swing_high:
-            for j in range(1, swing_length + 1):
-                if df.iloc[i + j]['high'] >= center_high:
-                    is_swing_high = False
-                    break
-        if is_swing_high:
-            df.iloc[i, df.columns.get_loc('swing_high')] = True
-            df.iloc[i, df.columns.get_loc('swing_high_price')] = center_high
-
-        is_swing_low = True
-        center_low = df.iloc[i]['low']
-        for j in range(1, swing_length + 1):
-            if df.iloc[i - j]['low'] <= center_low:
-                is_swing_low = False
-                break
-        if is_swing_low:
-            for j in range(1, swing_length + 1):
-                if df.iloc[i + j]['low'] <= center_low:
-                    is_swing_low = False
-                    break
-        if is_swing_low:
-            df.iloc[i, df.columns.get_loc('swing_low')] = True
-            df.iloc[i, df.columns.get_loc('swing_low_price')] = center_low
+    """Detects swing highs and swing lows using fractal logic (Kingsley).
 
+    A swing high's high is strictly above the swing_length highs on each side (lows mirrored).
+    """
+    highs = df['high'].to_numpy(dtype=float)
+    lows = df['low'].to_numpy(dtype=float)
+    is_swing_high, is_swing_low = _fractal_swings(highs, lows, swing_length)
+    df['swing_high'] = is_swing_high
+    df['swing_low'] = is_swing_low
+    df['swing_high_price'] = np.where(is_swing_high, highs, np.nan)
+    df['swing_low_price'] = np.where(is_swing_low, lows, np.nan)
     return df
 
 
@@ -64,31 +90,111 @@ def detect_break_of_structure(df):
     return _detect_bos_kingsley(df)
 
 
+def _structure_breaks_py(close, extreme, swing_mask, swing_price, bullish):
+    """
+    Sequential form of _structure_breaks (the original per-bar Kingsley loop on raw arrays).
+    Compiled with numba when available; NaN levels never compare true, so no break before the first swing.
+    """
+    side = 1.0 if bullish else -1.0
+    out = np.zeros(close.shape[0], dtype=np.bool_)
+    level = np.nan
+    for i in range(close.shape[0]):
+        if swing_mask[i]:
+            level = swing_price[i]
+        if side * close[i] > side * level:
+            out[i] = True
+            level = extreme[i]
+    return np.flatnonzero(out)
+
+
+def _structure_breaks_np(close, extreme, swing_mask, swing_price, bullish):
+    """
+    Positions where close breaks the running structure level (Kingsley rules).
+    The level is the last swing price; after a break it moves to that bar's extreme (high for
+    bullish, low for bearish) until the next swing. Only break positions are visited in Python.
+    """
+    n = len(close)
+    events = np.flatnonzero(swing_mask)
+    last_event = np.maximum.accumulate(np.where(swing_mask, np.arange(n), -1)) if n else np.empty(0, dtype=np.int64)
+    swing_level = np.where(last_event >= 0, swing_price[np.maximum(last_event, 0)], np.nan)
+    base_hits = np.flatnonzero(close > swing_level if bullish else close < swing_level)
+    breaks = []
+    pos = 0
+    while pos < n:
+        t = np.searchsorted(base_hits, pos)
+        if t == len(base_hits):
+            break
+        i = int(base_hits[t])
+        breaks.append(i)
+        while True:
+            e = np.searchsorted(events, i, side='right')
+            nxt = int(events[e]) if e < len(events) else n
+            seg = close[i + 1:nxt] > extreme[i] if bullish else close[i + 1:nxt] < extreme[i]
+            if seg.any():
+                i = i + 1 + int(np.argmax(seg))
+                breaks.append(i)
+                continue
+            pos = nxt
+            break
+    return np.asarray(breaks, dtype=np.int64)
+
+
+_HAVE_NUMBA = njit is not None
+if _HAVE_NUMBA:
+    _structure_breaks = njit(cache=True)(_structure_breaks_py)
+else:
+    _structure_breaks = _structure_breaks_np
+
+
+def _bos_masks(close, highs, lows, swing_high, swing_low, swing_high_price, swing_low_price):
+    """Bull/bear break masks (Kingsley). No breaks are flagged unless both swing highs and lows exist."""
+    bull = np.zeros(len(close), dtype=bool)
+    bear = np.zeros(len(close), dtype=bool)
+    if swing_high.any() and swing_low.any():
+        bull[_structure_breaks(close, highs, swing_high, swing_high_price, True)] = True
+        bear[_structure_breaks(close, lows, swing_low, swing_low_price, False)] = True
+    return bull, bear
+
+
 def _detect_bos_kingsley(df):
-    """Detects Break of Structure (Kingsley)."""
-    df['bos_bull'] = False
-    df['bos_bear'] = False
-    df['bos_direction'] = None
-    swing_highs = df[df['swing_high'] == True].copy()
-    swing_lows = df[df['swing_low'] == True].copy()
-    if swing_highs.empty or swing_lows.empty:
-        return df
-    last_swing_high = None
-    last_swing_low = None
-    for i in range(len(df)):
-        row = df.iloc[i]
-        if row['swing_high']:
-            last_swing_high = row['swing_high_price']
-        if row['swing_low']:
-            last_swing_low = row['swing_low_price']
-        if last_swing_high is not None and row['close'] > last_swing_high:
-            df.iloc[i, df.columns.get_loc('bos_bull')] = True
-            df.iloc[i, df.columns.get_loc('bos_direction')] = 'BULLISH'
-            last_swing_high = row['high']
-        if last_swing_low is not None and row['close'] < last_swing_low:
-            df.iloc[i, df.columns.get_loc('bos_bear')] = True
-            df.iloc[i, df.columns.get_loc('bos_direction')] = 'BEARISH'
-            last_swing_low = row['low']
+    """Detects Break of Structure (Kingsley). No breaks are flagged unless both swing highs and lows exist."""
+    bull, bear = _bos_masks(
+        df['close'].to_numpy(dtype=float),
+        df['high'].to_numpy(dtype=float),
+        df['low'].to_numpy(dtype=float),
+        df['swing_high'].to_numpy(dtype=bool),
+        df['swing_low'].to_numpy(dtype=bool),
+        df['swing_high_price'].to_numpy(dtype=float),
+        df['swing_low_price'].to_numpy(dtype=float),
+    )
+    df['bos_bull'] = bull
+    df['bos_bear'] = bear
+    df['bos_direction'] = _bos_direction_column(bull, bear, df.index)
+    return df
+
+
+def detect_swings_and_bos(df, swing_length=3):
+    """
+    detect_swing_highs_lows followed by detect_break_of_structure, same columns and config dispatch.
+    The Kingsley path reads high/low/close once and feeds the swing arrays straight into the BOS
+    kernel instead of writing the swing columns and reading them back.
+    """
+    if config and getattr(config, 'USE_LUXALGO_ICT', False):
+        return detect_break_of_structure(detect_swing_highs_lows(df, swing_length))
+    highs = df['high'].to_numpy(dtype=float)
+    lows = df['low'].to_numpy(dtype=float)
+    swing_high, swing_low = _fractal_swings(highs, lows, swing_length)
+    swing_high_price = np.where(swing_high, highs, np.nan)
+    swing_low_price = np.where(swing_low, lows, np.nan)
+    bull, bear = _bos_masks(df['close'].to_numpy(dtype=float), highs, lows,
+                            swing_high, swing_low, swing_high_price, swing_low_price)
+    df['swing_high'] = swing_high
+    df['swing_low'] = swing_low
+    df['swing_high_price'] = swing_high_price
+    df['swing_low_price'] = swing_low_price
+    df['bos_bull'] = bull
+    df['bos_bear'] = bear
+    df['bos_direction'] = _bos_direction_column(bull, bear, df.index)
     return df
 
 
@@ -101,35 +207,51 @@ def identify_order_block(df, bos_index, ob_lookback=20):
     return _identify_ob_kingsley(df, bos_index, ob_lookback=ob_lookback)
 
 
+def _ob_candidate(df, bos_index, ob_lookback):
+    """
+    Last opposite-colour candle before the BOS at bos_index, scanning back at most ob_lookback - 1 bars
+    (bearish candle for a bullish BOS, bullish for bearish). Returns (bar position, bos_direction) or (None, direction).
+    """
+    bos_direction = df['bos_direction'].iloc[bos_index]
+    if pd.isna(bos_direction) or bos_direction not in ('BULLISH', 'BEARISH'):
+        return None, bos_direction
+    lo = max(0, bos_index - ob_lookback) + 1
+    if lo >= bos_index:
+        return None, bos_direction
+    opens = df['open'].to_numpy(dtype=float)[lo:bos_index]
+    closes = df['close'].to_numpy(dtype=float)[lo:bos_index]
+    hits = np.flatnonzero(closes < opens if bos_direction == 'BULLISH' else closes > opens)
+    if len(hits) == 0:
+        return None, bos_direction
+    return lo + int(hits[-1]), bos_direction
+
+
 def _identify_ob_kingsley(df, bos_index, ob_lookback=20):
     """Identifies the order block before a BOS (Kingsley)."""
     if bos_index <= 0:
         return None
-    bos_row = df.iloc[bos_index]
-    bos_direction = bos_row['bos_direction']
-    if pd.isna(bos_direction):
+    i, bos_direction = _ob_candidate(df, bos_index, ob_lookback)
+    if i is None:
         return None
-    for i in range(bos_index - 1, max(0, bos_index - ob_lookback), -1):
-        candle = df.iloc[i]
-        if bos_direction == 'BULLISH':
-            if candle['close'] < candle['open']:
-                return {
-                    'high': candle['high'],
-                    'low': candle['low'],
-                    'midpoint': (candle['high'] + candle['low']) / 2,
-                    'time': df.index[i],
-                    'direction': 'BULLISH'
-                }
-        elif bos_direction == 'BEARISH':
-            if candle['close'] > candle['open']:
-                return {
-                    'high': candle['high'],
-                    'low': candle['low'],
-                    'midpoint': (candle['high'] + candle['low']) / 2,
-                    'time': df.index[i],
-                    'direction': 'BEARISH'
-                }
-    return None
+    high, low = float(df['high'].iloc[i]), float(df['low'].iloc[i])
+    return {
+        'high': high,
+        'low': low,
+        'midpoint': (high + low) / 2,
+        'time': df.index[i],
+        'direction': bos_direction
+    }
+
+
+def _extreme_after(values, ufunc, empty):
+    """
+    out[k] = ufunc-reduction (np.fmin / np.fmax, NaNs skipped) of values[k + 1:]; `empty` for the last bar.
+    Lets "did any later bar trade through this level" checks be one comparison per candidate.
+    """
+    if len(values) == 0:
+        return np.empty(0)
+    return np.append(ufunc.accumulate(values[::-1])[::-1][1:], empty)
+
 
 def detect_breaker_block(df, bias, ob_lookback=20, use_body=True):
     """
@@ -141,58 +263,41 @@ def detect_breaker_block(df, bias, ob_lookback=20, use_body=True):
     if df is None or df.empty or len(df) < 5:
         return None
     # Find last BOS bar in bias direction
-    bos_idx = None
-    for i in range(len(df) - 1, -1, -1):
-        if bias == "BULLISH" and df.iloc[i].get("bos_bull"):
-            bos_idx = i
-            break
-        if bias == "BEARISH" and df.iloc[i].get("bos_bear"):
-            bos_idx = i
-            break
-    if bos_idx is None or bos_idx <= 0:
+    bos_col = "bos_bull" if bias == "BULLISH" else "bos_bear" if bias == "BEARISH" else None
+    if bos_col not in df.columns:
         return None
-    # Look backward for OB in OPPOSITE direction
-    opp_direction = "BEARISH" if bias == "BULLISH" else "BULLISH"
-    for i in range(bos_idx - 1, max(0, bos_idx - ob_lookback), -1):
-        candle = df.iloc[i]
-        if opp_direction == "BEARISH":
-            if candle["close"] >= candle["open"]:
-                continue
-            ob_high = max(candle["open"], candle["close"]) if use_body else candle["high"]
-            ob_low = min(candle["open"], candle["close"]) if use_body else candle["low"]
-            # Check if broken: any bar between OB and BOS has low < ob_low
-            broken = False
-            for j in range(i + 1, bos_idx):
-                if df.iloc[j]["low"] < ob_low:
-                    broken = True
-                    break
-            if broken:
-                return {
-                    "high": ob_high,
-                    "low": ob_low,
-                    "midpoint": (ob_high + ob_low) / 2,
-                    "time": df.index[i],
-                    "direction": "BULLISH",
-                }
-        else:
-            if candle["close"] <= candle["open"]:
-                continue
-            ob_high = max(candle["open"], candle["close"]) if use_body else candle["high"]
-            ob_low = min(candle["open"], candle["close"]) if use_body else candle["low"]
-            broken = False
-            for j in range(i + 1, bos_idx):
-                if df.iloc[j]["high"] > ob_high:
-                    broken = True
-                    break
-            if broken:
-                return {
-                    "high": ob_high,
-                    "low": ob_low,
-                    "midpoint": (ob_high + ob_low) / 2,
-                    "time": df.index[i],
-                    "direction": "BEARISH",
-                }
-    return None
+    bos_bars = np.flatnonzero(df[bos_col].to_numpy(dtype=bool))
+    if len(bos_bars) == 0 or bos_bars[-1] <= 0:
+        return None
+    bos_idx = int(bos_bars[-1])
+    # Look backward for OB in OPPOSITE direction: candidates are bars (lo, bos_idx), nearest BOS first
+    lo = max(0, bos_idx - ob_lookback)
+    opens = df["open"].to_numpy(dtype=float)[:bos_idx]
+    closes = df["close"].to_numpy(dtype=float)[:bos_idx]
+    if use_body:
+        ob_highs, ob_lows = np.maximum(opens, closes), np.minimum(opens, closes)
+    else:
+        ob_highs, ob_lows = df["high"].to_numpy(dtype=float)[:bos_idx], df["low"].to_numpy(dtype=float)[:bos_idx]
+    if bias == "BULLISH":
+        # Failed bearish OB: some bar between OB and BOS has low < ob_low
+        is_candidate = closes < opens
+        broken = _extreme_after(df["low"].to_numpy(dtype=float)[:bos_idx], np.fmin, np.inf) < ob_lows
+    else:
+        # Failed bullish OB: some bar between OB and BOS has high > ob_high
+        is_candidate = closes > opens
+        broken = _extreme_after(df["high"].to_numpy(dtype=float)[:bos_idx], np.fmax, -np.inf) > ob_highs
+    hits = np.flatnonzero(is_candidate[lo + 1:] & broken[lo + 1:])
+    if len(hits) == 0:
+        return None
+    i = lo + 1 + int(hits[-1])
+    ob_high, ob_low = float(ob_highs[i]), float(ob_lows[i])
+    return {
+        "high": ob_high,
+        "low": ob_low,
+        "midpoint": (ob_high + ob_low) / 2,
+        "time": df.index[i],
+        "direction": bias,
+    }
 
 
 def detect_shallow_tap(price_low, price_high, ob_high, ob_low, ob_midpoint):
@@ -205,11 +310,18 @@ def higher_tf_bias_aligned(df_higher, idx, bias_str):
     """Check if higher TF has BOS matching bias at idx. Returns True if aligned, False if not."""
     if df_higher is None or df_higher.empty:
         return True
-    bars = df_higher[df_higher.index <= idx]
-    if bars.empty:
+    index = df_higher.index
+    if index.is_monotonic_increasing:
+        # Last higher-TF bar at or before idx by binary search (no full-frame mask per call)
+        pos = int(index.searchsorted(idx, side='right')) - 1
+    else:
+        at_or_before = np.flatnonzero(index <= idx)
+        pos = int(at_or_before[-1]) if len(at_or_before) else -1
+    if pos < 0:
         return False
-    row = bars.iloc[-1]
-    if not row.get('bos_bull') and not row.get('bos_bear'):
+    bull = 'bos_bull' in df_higher.columns and bool(df_higher['bos_bull'].iloc[pos])
+    bear = 'bos_bear' in df_higher.columns and bool(df_higher['bos_bear'].iloc[pos])
+    if not bull and not bear:
         return False
-    higher_bias = 'BULLISH' if row.get('bos_bull') else 'BEARISH'
+    higher_bias = 'BULLISH' if bull else 'BEARISH'
     return higher_bias == bias_str
@@ -2,6 +2,7 @@
 NAS Judas Strategy indicators.
 Structure shift after sweep (break of recent swing confirming direction).
 """
+import numpy as np
 import pandas as pd
 
 from .indicators_bos import detect_swing_highs_lows, detect_break_of_structure
@@ -22,30 +23,34 @@ def detect_structure_shift_after_sweep(
     if "bos_bull" not in df.columns:
         df = detect_break_of_structure(df)
 
-    row = df.iloc[idx]
-    window = df.iloc[sweep_idx : idx + 1]
+    close = df["close"].iloc[idx]
+
+    def _last_swing_in_window(mask_col, price_col):
+        # Most recent swing in bars sweep_idx..idx (positional), read straight from the column arrays
+        hits = np.flatnonzero(df[mask_col].to_numpy(dtype=bool)[sweep_idx : idx + 1])
+        if len(hits) == 0:
+            return None
+        return float(df[price_col].to_numpy(dtype=float)[sweep_idx : idx + 1][hits[-1]])
 
     if direction == "BULLISH":
-        past_lows = window[window["swing_low"] == True]["swing_low_price"]
-        if past_lows.empty:
+        swing_level = _last_swing_in_window("swing_low", "swing_low_price")
+        if swing_level is None:
             return {"shifted": False, "swing_level": None, "reasoning": "no swing low to break"}
-        swing_level = float(past_lows.iloc[-1])
-        if row["close"] > swing_level:
+        if close > swing_level:
             return {
                 "shifted": True,
                 "swing_level": swing_level,
-                "reasoning": f"BOS: close {row['close']:.1f} > swing {swing_level:.1f}",
+                "reasoning": f"BOS: close {close:.1f} > swing {swing_level:.1f}",
             }
     else:
-        past_highs = window[window["swing_high"] == True]["swing_high_price"]
-        if past_highs.empty:
+        swing_level = _last_swing_in_window("swing_high", "swing_high_price")
+        if swing_level is None:
             return {"shifted": False, "swing_level": None, "reasoning": "no swing high to break"}
-        swing_level = float(past_highs.iloc[-1])
-        if row["close"] < swing_level:
+        if close < swing_level:
             return {
                 "shifted": True,
                 "swing_level": swing_level,
-                "reasoning": f"BOS: close {row['close']:.1f} < swing {swing_level:.1f}",
+                "reasoning": f"BOS: close {close:.1f} < swing {swing_level:.1f}",
             }
 
     return {"shifted": False, "swing_level": None, "reasoning": "no structure shift"}
@@ -11,40 +11,46 @@ Config: USE_LUXALGO_ICT, LUXALGO_SWING_LENGTH, LUXALGO_OB_USE_BODY
 import pandas as pd
 import numpy as np
 
+from .indicators_bos import _bos_direction_column, _ob_candidate, _structure_breaks
+
+
+def _pivot_extremes(arr, left, right, reduce, pad):
+    """
+    reduce (np.max / np.min) over the window [p - left, p + right] for every confirmed pivot slot p
+    (p <= n - 1 - left - right); the window is truncated at the start of the series.
+    """
+    n = len(arr)
+    count = n - left - right
+    if count <= 0:
+        return np.empty(0)
+    padded = np.concatenate([np.full(left, pad), arr])
+    windows = np.lib.stride_tricks.sliding_window_view(padded, left + right + 1)[:count]
+    return reduce(windows, axis=1)
+
 
 def _pivot_high(high_series, left, right=1):
     """Pivot high: bar at (current - left - right) is highest in window."""
-    result = pd.Series(index=high_series.index, dtype=float)
-    arr = high_series.values
-    n = len(arr)
-    for i in range(left + right, n):
-        pivot_idx = i - left - right
-        start = max(0, pivot_idx - left)
-        end = min(n, pivot_idx + right + 1)
-        window_max = np.max(arr[start:end])
-        if arr[pivot_idx] >= window_max:
-            result.iloc[pivot_idx] = arr[pivot_idx]
-    return result
+    arr = high_series.to_numpy(dtype=float)
+    window_max = _pivot_extremes(arr, left, right, np.max, -np.inf)
+    result = np.full(len(arr), np.nan)
+    head = arr[:len(window_max)]
+    result[:len(window_max)] = np.where(head >= window_max, head, np.nan)
+    return pd.Series(result, index=high_series.index)
 
 
 def _pivot_low(low_series, left, right=1):
     """Pivot low: bar at (current - left - right) is lowest in window."""
-    result = pd.Series(index=low_series.index, dtype=float)
-    arr = low_series.values
-    n = len(arr)
-    for i in range(left + right, n):
-        pivot_idx = i - left - right
-        start = max(0, pivot_idx - left)
-        end = min(n, pivot_idx + right + 1)
-        window_min = np.min(arr[start:end])
-        if arr[pivot_idx] <= window_min:
-            result.iloc[pivot_idx] = arr[pivot_idx]
-    return result
+    arr = low_series.to_numpy(dtype=float)
+    window_min = _pivot_extremes(arr, left, right, np.min, np.inf)
+    result = np.full(len(arr), np.nan)
+    head = arr[:len(window_min)]
+    result[:len(window_min)] = np.where(head <= window_min, head, np.nan)
+    return pd.Series(result, index=low_series.index)
 
 
 def detect_swing_highs_lows(df, swing_length=5):
     """Detects swing highs and lows using pivot logic (LuxAlgo ta.pivothigh/ta.pivotlow)."""
-    df = df.copy()
+    df = df.copy(deep=False)
     right = 1
     ph = _pivot_high(df['high'], swing_length, right)
     pl = _pivot_low(df['low'], swing_length, right)
@@ -57,37 +63,22 @@ def detect_swing_highs_lows(df, swing_length=5):
 
 
 def detect_break_of_structure(df):
-    """Detects MSS (Market Structure Shift) and BOS (Break of Structure)."""
-    df = df.copy()
-    df['bos_bull'] = False
-    df['bos_bear'] = False
-    df['bos_direction'] = None
-
-    last_swing_high = None
-    last_swing_low = None
-    mss_dir = 0  # -1 bearish, 0 neutral, 1 bullish
-
-    for i in range(len(df)):
-        row = df.iloc[i]
-        if row['swing_high']:
-            last_swing_high = row['swing_high_price']
-        if row['swing_low']:
-            last_swing_low = row['swing_low_price']
-
-        if last_swing_high is not None and row['close'] > last_swing_high:
-            if mss_dir < 1:
-                mss_dir = 1
-            df.iloc[i, df.columns.get_loc('bos_bull')] = True
-            df.iloc[i, df.columns.get_loc('bos_direction')] = 'BULLISH'
-            last_swing_high = row['high']
-
-        if last_swing_low is not None and row['close'] < last_swing_low:
-            if mss_dir > -1:
-                mss_dir = -1
-            df.iloc[i, df.columns.get_loc('bos_bear')] = True
-            df.iloc[i, df.columns.get_loc('bos_direction')] = 'BEARISH'
-            last_swing_low = row['low']
-
+    """Detects MSS (Market Structure Shift) and BOS (Break of Structure).
+
+    The first break against the prevailing direction is the MSS, later ones in the same direction are
+    BOS; both are flagged the same way, so the scan is shared with the Kingsley detector.
+    """
+    df = df.copy(deep=False)
+    close = df['close'].to_numpy(dtype=float)
+    bull = np.zeros(len(df), dtype=bool)
+    bear = np.zeros(len(df), dtype=bool)
+    bull[_structure_breaks(close, df['high'].to_numpy(dtype=float), df['swing_high'].to_numpy(dtype=bool),
+                           df['swing_high_price'].to_numpy(dtype=float), True)] = True
+    bear[_structure_breaks(close, df['low'].to_numpy(dtype=float), df['swing_low'].to_numpy(dtype=bool),
+                           df['swing_low_price'].to_numpy(dtype=float), False)] = True
+    df['bos_bull'] = bull
+    df['bos_bear'] = bear
+    df['bos_direction'] = _bos_direction_column(bull, bear, df.index)
     return df
 
 
@@ -95,41 +86,22 @@ def identify_order_block(df, bos_index, ob_lookback=20, use_body=True):
     """Identifies order block before BOS, with breaker invalidation (LuxAlgo-style)."""
     if bos_index <= 0:
         return None
-    bos_row = df.iloc[bos_index]
-    bos_direction = bos_row['bos_direction']
-    if pd.isna(bos_direction):
+    i, bos_direction = _ob_candidate(df, bos_index, ob_lookback)
+    if i is None:
         return None
-
-    for i in range(bos_index - 1, max(0, bos_index - ob_lookback), -1):
-        candle = df.iloc[i]
-        if bos_direction == 'BULLISH':
-            if candle['close'] < candle['open']:
-                ob_high = max(candle['open'], candle['close']) if use_body else candle['high']
-                ob_low = min(candle['open'], candle['close']) if use_body else candle['low']
-                ob_mid = (ob_high + ob_low) / 2
-                for j in range(i + 1, bos_index):
-                    if df.iloc[j]['low'] < ob_low:
-                        return None
-                return {
-                    'high': ob_high,
-                    'low': ob_low,
-                    'midpoint': ob_mid,
-                    'time': df.index[i],
-                    'direction': 'BULLISH'
-                }
-        elif bos_direction == 'BEARISH':
-            if candle['close'] > candle['open']:
-                ob_high = max(candle['open'], candle['close']) if use_body else candle['high']
-                ob_low = min(candle['open'], candle['close']) if use_body else candle['low']
-                ob_mid = (ob_high + ob_low) / 2
-                for j in range(i + 1, bos_index):
-                    if df.iloc[j]['high'] > ob_high:
-                        return None
-                return {
-                    'high': ob_high,
-                    'low': ob_low,
-                    'midpoint': ob_mid,
-                    'time': df.index[i],
-                    'direction': 'BEARISH'
-                }
-    return None
+    o, c = float(df['open'].iloc[i]), float(df['close'].iloc[i])
+    ob_high = max(o, c) if use_body else float(df['high'].iloc[i])
+    ob_low = min(o, c) if use_body else float(df['low'].iloc[i])
+    # Breaker: a bar between the OB and the BOS traded through it (NaN bars never count)
+    if bos_direction == 'BULLISH':
+        if np.fmin.reduce(df['low'].to_numpy(dtype=float)[i + 1:bos_index], initial=np.inf) < ob_low:
+            return None
+    elif np.fmax.reduce(df['high'].to_numpy(dtype=float)[i + 1:bos_index], initial=-np.inf) > ob_high:
+        return None
+    return {
+        'high': ob_high,
+        'low': ob_low,
+        'midpoint': (ob_high + ob_low) / 2,
+        'time': df.index[i],
+        'direction': bos_direction
+    }
@@ -17,39 +17,34 @@ def detect_liquidity_sweep_m15(df, lookback=5, min_sweep_points=None):
     """
     if 'swing_high' not in df.columns:
         df = detect_swing_highs_lows(df, swing_length=3)
-    df = df.copy()
-    df['sweep_high'] = False
-    df['sweep_low'] = False
-    df['sweep_high_price'] = np.nan
-    df['sweep_low_price'] = np.nan
-    df['sweep_high_size'] = 0.0
-    df['sweep_low_size'] = 0.0
-
-    recent_highs = df[df['swing_high'] == True][['swing_high_price']].copy()
-    recent_lows = df[df['swing_low'] == True][['swing_low_price']].copy()
+    df = df.copy(deep=False)
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
+    close = df['close'].to_numpy(dtype=float)
+    liq_high = _recent_swing_level(df, 'swing_high', 'swing_high_price', lookback)
+    liq_low = _recent_swing_level(df, 'swing_low', 'swing_low_price', lookback)
+    swept_high = (high > liq_high) & (close < liq_high)
+    swept_low = (low < liq_low) & (close > liq_low)
+    df['sweep_high'] = swept_high
+    df['sweep_low'] = swept_low
+    df['sweep_high_price'] = np.where(swept_high, low, np.nan)
+    df['sweep_low_price'] = np.where(swept_low, high, np.nan)
+    df['sweep_high_size'] = np.where(swept_high, high - liq_high, 0.0)
+    df['sweep_low_size'] = np.where(swept_low, liq_low - low, 0.0)
+    return df
 
-    for i in range(lookback, len(df)):
-        row = df.iloc[i]
-        past_highs = df.iloc[max(0, i - lookback):i]
-        past_lows = df.iloc[max(0, i - lookback):i]
-        sh = past_highs[past_highs['swing_high'] == True]['swing_high_price']
-        sl = past_lows[past_lows['swing_low'] == True]['swing_low_price']
-        if not sh.empty:
-            liq_high = float(sh.iloc[-1])
-            if row['high'] > liq_high and row['close'] < liq_high:
-                df.iloc[i, df.columns.get_loc('sweep_high')] = True
-                df.iloc[i, df.columns.get_loc('sweep_high_price')] = row['low']
-                size = row['high'] - liq_high
-                df.iloc[i, df.columns.get_loc('sweep_high_size')] = size
-        if not sl.empty:
-            liq_low = float(sl.iloc[-1])
-            if row['low'] < liq_low and row['close'] > liq_low:
-                df.iloc[i, df.columns.get_loc('sweep_low')] = True
-                df.iloc[i, df.columns.get_loc('sweep_low_price')] = row['high']
-                size = liq_low - row['low']
-                df.iloc[i, df.columns.get_loc('sweep_low_size')] = size
 
-    return df
+def _recent_swing_level(df, mask_col, price_col, lookback):
+    """Per bar i (i >= lookback): price of the most recent swing in bars [i - lookback, i - 1], else NaN."""
+    n = len(df)
+    if n == 0:
+        return np.empty(0)
+    bars = np.arange(n)
+    last_swing = np.maximum.accumulate(np.where(df[mask_col].to_numpy(dtype=bool), bars, -1))
+    prev_swing = np.concatenate([[-1], last_swing[:-1]])
+    in_window = (prev_swing >= 0) & (prev_swing >= bars - lookback) & (bars >= lookback)
+    prices = df[price_col].to_numpy(dtype=float)
+    return np.where(in_window, prices[np.maximum(prev_swing, 0)], np.nan)
 
 
 def detect_liquidity_sweep(df, lookback=5, min_sweep_points=0):
@@ -83,36 +78,38 @@ def detect_liquidity_sweep(df, lookback=5, min_sweep_points=0):
 def get_fvg_zones(df, min_fvg_size=0, max_fvg_age=None, current_bar_idx=None):
     """
     Get FVG zones with size and age. Returns list of {top, bottom, size, bar_index, age, direction}.
+    Filters are applied as masks over all bars; dicts are built only for surviving zones.
     """
     if 'fvg_bull' not in df.columns:
         df = detect_fvg(df)
+    n = len(df)
+    if n < 3:
+        return []
+    high = df['high'].to_numpy(dtype=float)
+    low = df['low'].to_numpy(dtype=float)
+    bars = np.arange(2, n)
+    ages = current_bar_idx - bars if current_bar_idx is not None else np.zeros(n - 2, dtype=np.int64)
+
+    def _passes(flag_col, top, bottom):
+        flag = df[flag_col].to_numpy(dtype=bool)[2:] if flag_col in df.columns else np.zeros(n - 2, dtype=bool)
+        ok = flag & (top > bottom)
+        if min_fvg_size:
+            ok &= (top - bottom) >= min_fvg_size
+        if max_fvg_age is not None:
+            ok &= ages <= max_fvg_age
+        return flag, ok
+
+    bull_top, bull_bottom = low[2:], high[:-2]
+    bear_top, bear_bottom = high[2:], low[:-2]
+    bull_flag, bull_ok = _passes('fvg_bull', bull_top, bull_bottom)
+    _, bear_ok = _passes('fvg_bear', bear_top, bear_bottom)
+    # A flagged bull bar that fails its filters skips the bear check on that bar (as the per-bar scan did)
+    bear_ok &= ~(bull_flag & ~bull_ok)
+
     zones = []
-    for i in range(2, len(df)):
-        row = df.iloc[i]
-        if row.get('fvg_bull'):
-            c1_high = df.iloc[i - 2]['high']
-            c3_low = row['low']
-            top, bottom = c3_low, c1_high
-            if top <= bottom:
-                continue
-            size = top - bottom
-            if min_fvg_size and size < min_fvg_size:
-                continue
-            age = (current_bar_idx - i) if current_bar_idx is not None else 0
-            if max_fvg_age is not None and age > max_fvg_age:
-                continue
-            zones.append({"top": top, "bottom": bottom, "size": size, "bar_index": i, "age": age, "direction": "bull"})
-        if row.get('fvg_bear'):
-            c1_low = df.iloc[i - 2]['low']
-            c3_high = row['high']
-            top, bottom = c3_high, c1_low
-            if top <= bottom:
-                continue
-            size = top - bottom
-            if min_fvg_size and size < min_fvg_size:
-                continue
-            age = (current_bar_idx - i) if current_bar_idx is not None else 0
-            if max_fvg_age is not None and age > max_fvg_age:
-                continue
-            zones.append({"top": top, "bottom": bottom, "size": size, "bar_index": i, "age": age, "direction": "bear"})
+    for k in np.flatnonzero(bull_ok | bear_ok).tolist():
+        for ok, top, bottom, direction in ((bull_ok, bull_top, bull_bottom, "bull"), (bear_ok, bear_top, bear_bottom, "bear")):
+            if ok[k]:
+                zones.append({"top": float(top[k]), "bottom": float(bottom[k]), "size": float(top[k] - bottom[k]),
+                              "bar_index": k + 2, "age": int(ages[k]), "direction": direction})
     return zones
@@ -2,12 +2,13 @@ import os
 import time
 import config
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
 from .connector_interface import get_connector, TIMEFRAME_M1, TIMEFRAME_M5, TIMEFRAME_M15, TIMEFRAME_H1, TIMEFRAME_H4, TIMEFRAME_D1
 from .paper_trading import PaperTrading
 from .trade_approver import TradeApprover
 from .strategies import MarvellousStrategy, VesterStrategy, FollowStrategy
-from .indicators_bos import detect_swing_highs_lows, detect_break_of_structure
+from .indicators_bos import detect_swings_and_bos
 from ai import get_signal_confidence, explain_trade, speak
 from .telegram_notifier import send_setup_notification
 
@@ -58,6 +59,17 @@ class LiveTradingEngine:
         self.trades_today = []
         self.running = False
         self._trades_per_setup = {}  # (symbol, type, setup_key) -> count
+        self._trade_counts = {}  # (date, session or None, symbol or None) -> count; today's keys only
+        self._broker_symbols = None  # names from one symbols_get(); reloaded after connect()
+        self._bias_of_hour = {}  # symbol -> (UTC hour, bias dict); bias only moves on H1/D1 closes
+        self._bias_cache = {}  # (symbol, label) -> (bar key, bias) for the last closed bar seen
+        self._bar_cache = {}  # (symbol, timeframe) -> (count, df); cleared at the start of every loop iteration
+        self._last_signals = None  # (input bar key, signals_df) from the last strategy run
+        self._positions_by_symbol = None  # symbol -> open positions; reset each loop iteration and after an order
+        self._account_info = None  # account snapshot for lot sizing/margin/approval; reset like _positions_by_symbol
+        # Telegram posts run on one background thread so a slow HTTP call doesn't stall the loop
+        self._notify_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='notify')
+        self._notify_pending = []
 
     def _get_setup_key(self, signal):
         """Return hashable key (symbol, type, setup_str) for setup tracking, or None if not applicable."""
@@ -116,14 +128,100 @@ class LiveTradingEngine:
         if key is not None:
             self._trades_per_setup[key] = self._trades_per_setup.get(key, 0) + 1
 
+    def _record_trade_count(self, trade):
+        """Bump today's day/session counters (overall and per symbol) for an executed trade."""
+        day = trade['time'].date()
+        if any(k[0] != day for k in self._trade_counts):
+            self._trade_counts = {k: v for k, v in self._trade_counts.items() if k[0] == day}
+        session = getattr(config, 'TRADE_SESSION_HOURS', {}).get(trade['time'].hour)
+        for key in {(day, None, None), (day, None, trade.get('symbol')), (day, session, None), (day, session, trade.get('symbol'))}:
+            self._trade_counts[key] = self._trade_counts.get(key, 0) + 1
+
+    def _get_bars(self, symbol, timeframe, count):
+        """
+        mt5.get_bars through the per-iteration cache: bias-of-day and the strategy read the same
+        D1/H1 bars, so each (symbol, timeframe) costs one terminal round trip per loop iteration.
+        A cached fetch of at least `count` bars is served as its last `count` rows; a missing symbol stays None.
+        """
+        key = (symbol, timeframe)
+        cached = self._bar_cache.get(key)
+        if cached is not None:
+            cached_count, df = cached
+            if df is None or cached_count == count:
+                return df
+            if cached_count > count:
+                return df.tail(count)
+        df = self.mt5.get_bars(symbol, timeframe, count=count)
+        self._bar_cache[key] = (count, df)
+        return df
+
+    def _symbol_candidates(self, candidates):
+        """
+        Probe order for this strategy: the configured priority order, empties and duplicates removed.
+        Names the broker doesn't list are dropped (unless that would leave nothing to try).
+        """
+        candidates = list(dict.fromkeys(s for s in candidates if s))
+        if self._broker_symbols is None:
+            self._broker_symbols = self.mt5.get_symbol_names() or set()
+        listed = [s for s in candidates if s in self._broker_symbols]
+        return listed or candidates
+
+    def _get_positions_for_symbol(self, symbol):
+        """Open positions for symbol, from one get_positions() call per loop iteration (paper or MT5)."""
+        if self._positions_by_symbol is None:
+            by_symbol = {}
+            for p in (self.paper.get_positions() if self.paper_mode else self.mt5.get_positions()):
+                by_symbol.setdefault(p.get('symbol'), []).append(p)
+            self._positions_by_symbol = by_symbol
+        return self._positions_by_symbol.get(symbol, [])
+
+    def _get_account_info(self):
+        """Account info (paper or MT5), fetched at most once per loop iteration until an order is placed."""
+        if self._account_info is None:
+            self._account_info = self.paper.get_account_info() if self.paper_mode else self.mt5.get_account_info()
+        return self._account_info
+
+    def _notify(self, fn, *args):
+        """Queue fn(*args) on the notification thread; drops it when 32 are already waiting."""
+        self._notify_pending = [f for f in self._notify_pending if not f.done()]
+        if len(self._notify_pending) >= 32:
+            if getattr(config, 'MT5_VERBOSE', False):
+                print(f"[NOTIFY] Queue full, dropped {getattr(fn, '__name__', fn)}")
+            return
+        self._notify_pending.append(self._notify_pool.submit(fn, *args))
+
+    def _run_strategy_cached(self, symbol, frames, build):
+        """
+        prepare_data + run_backtest on build(), unless the input bars match the previous run.
+        Strategies read the forming bar, so by default its OHLC is part of the key (not tick volume,
+        which moves every tick and no strategy reads); with LIVE_EVALUATE_ON_BAR_CLOSE only the bar
+        times are compared (re-run once per new bar).
+        """
+        on_close = getattr(config, 'LIVE_EVALUATE_ON_BAR_CLOSE', False)
+        key = (self.strategy_name, symbol) + tuple(
+            None if df is None else (
+                len(df), tuple(df.index[-1:]),
+                () if on_close else tuple(df[['open', 'high', 'low', 'close']].iloc[-1:].to_numpy().ravel()),
+            )
+            for df in frames
+        )
+        if self._last_signals is not None and self._last_signals[0] == key:
+            return self._last_signals[1]
+        strat = build()
+        strat.prepare_data()
+        signals_df = strat.run_backtest()
+        self._last_signals = (key, signals_df)
+        return signals_df
+
     def connect(self):
+        self._broker_symbols = None
         return self.mt5.connect()
 
     def disconnect(self):
         self.mt5.disconnect()
 
-    def check_safety_limits(self):
-        now_utc = datetime.utcnow()
+    def check_safety_limits(self, now_utc=None):
+        now_utc = now_utc or datetime.utcnow()
         today = now_utc.date()
         session_hours = getattr(config, 'TRADE_SESSION_HOURS', {})
         max_per_session = getattr(config, 'MAX_TRADES_PER_SESSION', None)
@@ -144,8 +242,7 @@ class LiveTradingEngine:
         if getattr(config, 'MAX_TRADES_PER_DAY_PER_PAIR', False):
             return True
 
-        trades_today = [t for t in self.trades_today if t['time'].date() == today]
-        if len(trades_today) >= config.MAX_TRADES_PER_DAY:
+        if self._trade_counts.get((today, None, None), 0) >= config.MAX_TRADES_PER_DAY:
             self._limit_reason = "Daily trade limit reached"
             print(f"[SAFETY] Daily trade limit reached ({config.MAX_TRADES_PER_DAY})")
             return False
@@ -153,39 +250,28 @@ class LiveTradingEngine:
         if max_per_session is not None and session_hours:
             current_session = session_hours.get(now_utc.hour)
             if current_session is not None:
-                trades_in_session = [
-                    t for t in trades_today
-                    if session_hours.get(t['time'].hour) == current_session
-                ]
-                if len(trades_in_session) >= max_per_session:
+                if self._trade_counts.get((today, current_session, None), 0) >= max_per_session:
                     self._limit_reason = "Session trade limit reached"
                     print(f"[SAFETY] Session limit reached ({max_per_session} per {current_session})")
                     return False
         return True
 
-    def _can_trade_symbol(self, symbol):
+    def _can_trade_symbol(self, symbol, now_utc=None):
         """Check if we can trade this symbol (per-pair daily/session limits). Returns (True, None) or (False, reason)."""
         if not symbol:
             return True, None
-        now_utc = datetime.utcnow()
+        now_utc = now_utc or datetime.utcnow()
         today = now_utc.date()
         session_hours = getattr(config, 'TRADE_SESSION_HOURS', {})
         max_per_session = getattr(config, 'MAX_TRADES_PER_SESSION', None)
 
-        trades_today = [t for t in self.trades_today if t['time'].date() == today]
-        trades_for_symbol = [t for t in trades_today if t.get('symbol') == symbol]
-
-        if len(trades_for_symbol) >= config.MAX_TRADES_PER_DAY:
+        if self._trade_counts.get((today, None, symbol), 0) >= config.MAX_TRADES_PER_DAY:
             return False, f"Daily limit reached for {symbol} ({config.MAX_TRADES_PER_DAY})"
 
         if max_per_session is not None and session_hours:
             current_session = session_hours.get(now_utc.hour)
             if current_session is not None:
-                trades_in_session = [
-                    t for t in trades_for_symbol
-                    if session_hours.get(t['time'].hour) == current_session
-                ]
-                if len(trades_in_session) >= max_per_session:
+                if self._trade_counts.get((today, current_session, symbol), 0) >= max_per_session:
                     return False, f"Session limit reached for {symbol} ({max_per_session} per {current_session})"
         return True, None
 
@@ -217,14 +303,23 @@ class LiveTradingEngine:
 
     def _get_bias_of_day(self, symbol):
         """Compute ICT-style bias from last closed Daily and H1 bars (BOS). Returns {'daily': str, 'h1': str} or None."""
+        hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        cached = self._bias_of_hour.get(symbol)
+        if cached is not None and cached[0] == hour:
+            return dict(cached[1])
         result = {}
         for label, tf_const, count in [('daily', TIMEFRAME_D1, 50), ('h1', TIMEFRAME_H1, 200)]:
-            df = self.mt5.get_bars(symbol, tf_const, count=count)
+            df = self._get_bars(symbol, tf_const, count)
             if df is None or len(df) < 5:
                 return None
-            df = df.copy()
-            df = detect_swing_highs_lows(df, swing_length=3)
-            df = detect_break_of_structure(df)
+            # The forming bar's high/low can still confirm a swing just behind the last closed bar
+            bar_key = (df.index[-1], float(df['high'].iat[-1]), float(df['low'].iat[-1]))
+            cached = self._bias_cache.get((symbol, label))
+            if cached is not None and cached[0] == bar_key:
+                result[label] = cached[1]
+                continue
+            # Swings/BOS only read high/low/close; copy those so the shared bar cache stays untouched
+            df = detect_swings_and_bos(df[['high', 'low', 'close']].copy(), swing_length=3)
             last_closed = df.iloc[-2] if len(df) >= 2 else df.iloc[-1]
             if last_closed.get('bos_bull'):
                 result[label] = 'BULLISH'
@@ -232,9 +327,12 @@ class LiveTradingEngine:
                 result[label] = 'BEARISH'
             else:
                 result[label] = 'NEUTRAL'
+            self._bias_cache[(symbol, label)] = (bar_key, result[label])
+        self._bias_of_hour[symbol] = (hour, dict(result))
         return result
 
     def run_strategy(self):
+        live_debug = getattr(config, 'LIVE_DEBUG', False)
         symbol = (
             (config.cli_symbol_to_mt5(self.cli_symbol) if self.cli_symbol else None) or
             config.LIVE_SYMBOLS.get('XAUUSD') or
@@ -247,31 +345,29 @@ class LiveTradingEngine:
             # CLI --symbol overrides: try that MT5 symbol first (e.g. BTC-USD -> BTCUSDm)
             cli_mt5 = config.cli_symbol_to_mt5(self.cli_symbol) if self.cli_symbol else None
             marv_live = getattr(config, 'MARVELLOUS_LIVE_SYMBOL', mc.MARVELLOUS_LIVE_SYMBOL)
-            gold_symbols = list(dict.fromkeys([
-                s for s in [cli_mt5, marv_live, symbol, 'XAUUSD', 'XAUUSDm'] if s
-            ]))
+            gold_symbols = self._symbol_candidates([cli_mt5, marv_live, symbol, 'XAUUSD', 'XAUUSDm'])
             entry_tf = getattr(mc, 'ENTRY_TIMEFRAME', '5m')
             df_daily = df_4h = df_h1 = df_m15 = df_entry = None
             for sym in gold_symbols:
-                df_daily = self.mt5.get_bars(sym, TIMEFRAME_D1, count=50)
-                df_4h = self.mt5.get_bars(sym, TIMEFRAME_H4, count=100)
-                df_h1 = self.mt5.get_bars(sym, TIMEFRAME_H1, count=200)
-                df_m15 = self.mt5.get_bars(sym, TIMEFRAME_M15, count=1000)
+                df_daily = self._get_bars(sym, TIMEFRAME_D1, 50)
+                df_4h = self._get_bars(sym, TIMEFRAME_H4, 100)
+                df_h1 = self._get_bars(sym, TIMEFRAME_H1, 200)
+                df_m15 = self._get_bars(sym, TIMEFRAME_M15, 1000)
                 if entry_tf == '15m':
                     df_entry = df_m15.copy() if df_m15 is not None else None
                 else:
                     tf_entry = TIMEFRAME_M1 if entry_tf == '1m' else TIMEFRAME_M5
-                    df_entry = self.mt5.get_bars(sym, tf_entry, count=1000)
+                    df_entry = self._get_bars(sym, tf_entry, 1000)
                 if all(x is not None for x in (df_daily, df_4h, df_h1, df_m15, df_entry)):
                     symbol = sym
                     break
             if df_h1 is None or df_m15 is None or df_entry is None:
-                if getattr(config, 'LIVE_DEBUG', False):
+                if live_debug:
                     print(f"[LIVE_DEBUG] marvellous: Bar data missing (tried: {gold_symbols})")
                 return []
-            if getattr(config, 'LIVE_DEBUG', False):
+            if live_debug:
                 print(f"[LIVE_DEBUG] {symbol} marvellous: D1/4H/H1/M15/Entry({entry_tf}) loaded")
-            strat = MarvellousStrategy(
+            signals_df = self._run_strategy_cached(symbol, (df_daily, df_4h, df_h1, df_m15, df_entry), lambda: MarvellousStrategy(
                 df_daily=df_daily,
                 df_4h=df_4h,
                 df_h1=df_h1,
@@ -279,73 +375,63 @@ class LiveTradingEngine:
                 df_entry=df_entry,
                 symbol=symbol,
                 verbose=False,
-            )
-            strat.prepare_data()
-            signals_df = strat.run_backtest()
-            if getattr(config, 'LIVE_DEBUG', False) and signals_df.empty:
+            ))
+            if live_debug and signals_df.empty:
                 print(f"[LIVE_DEBUG] marvellous: 0 signals")
         elif self.strategy_name == 'vester':
             from . import vester_config as vc
             cli_mt5 = config.cli_symbol_to_mt5(self.cli_symbol) if self.cli_symbol else None
             vester_live = getattr(config, 'VESTER_LIVE_SYMBOL', vc.VESTER_LIVE_SYMBOL)
-            vester_symbols = list(dict.fromkeys([
-                s for s in [cli_mt5, vester_live, symbol, 'XAUUSD', 'XAUUSDm'] if s
-            ]))
+            vester_symbols = self._symbol_candidates([cli_mt5, vester_live, symbol, 'XAUUSD', 'XAUUSDm'])
             df_h1 = df_m5 = df_m1 = df_h4 = None
             agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
             for sym in vester_symbols:
-                df_h1 = self.mt5.get_bars(sym, TIMEFRAME_H1, count=200)
-                df_m5 = self.mt5.get_bars(sym, TIMEFRAME_M5, count=1000)
-                df_m1 = self.mt5.get_bars(sym, TIMEFRAME_M1, count=1000)
+                df_h1 = self._get_bars(sym, TIMEFRAME_H1, 200)
+                df_m5 = self._get_bars(sym, TIMEFRAME_M5, 1000)
+                df_m1 = self._get_bars(sym, TIMEFRAME_M1, 1000)
                 if all(x is not None for x in (df_h1, df_m5, df_m1)):
                     symbol = sym
                     df_h4 = df_h1.resample("4h").agg(agg).dropna()
                     break
             if df_h1 is None or df_m5 is None or df_m1 is None:
-                if getattr(config, 'LIVE_DEBUG', False):
+                if live_debug:
                     print(f"[LIVE_DEBUG] vester: Bar data missing (tried: {vester_symbols})")
                 return []
-            if getattr(config, 'LIVE_DEBUG', False):
+            if live_debug:
                 print(f"[LIVE_DEBUG] {symbol} vester: H1/M5/M1" + ("/4H" if df_h4 is not None else "") + " loaded")
-            strat = VesterStrategy(
+            signals_df = self._run_strategy_cached(symbol, (df_h1, df_m5, df_m1), lambda: VesterStrategy(
                 df_h1=df_h1,
                 df_m5=df_m5,
                 df_m1=df_m1,
                 df_h4=df_h4,
                 symbol=symbol,
                 verbose=False,
-            )
-            strat.prepare_data()
-            signals_df = strat.run_backtest()
-            if getattr(config, 'LIVE_DEBUG', False) and signals_df.empty:
+            ))
+            if live_debug and signals_df.empty:
                 print(f"[LIVE_DEBUG] vester: 0 signals")
         elif self.strategy_name == 'follow':
             cli_mt5 = config.cli_symbol_to_mt5(self.cli_symbol) if self.cli_symbol else None
-            follow_symbols = list(dict.fromkeys([
-                s for s in [cli_mt5, symbol, 'XAUUSD', 'XAUUSDm'] if s
-            ]))
+            follow_symbols = self._symbol_candidates([cli_mt5, symbol, 'XAUUSD', 'XAUUSDm'])
             df_m5 = None
             for sym in follow_symbols:
-                df_m5 = self.mt5.get_bars(sym, TIMEFRAME_M5, count=1000)
+                df_m5 = self._get_bars(sym, TIMEFRAME_M5, 1000)
                 if df_m5 is not None and not df_m5.empty:
                     symbol = sym
                     break
             if df_m5 is None or df_m5.empty:
-                if getattr(config, 'LIVE_DEBUG', False):
+                if live_debug:
                     print(f"[LIVE_DEBUG] follow: M5 bar data missing (tried: {follow_symbols})")
                 return []
-            if getattr(config, 'LIVE_DEBUG', False):
+            if live_debug:
                 print(f"[LIVE_DEBUG] {symbol} follow: M5 loaded")
-            strat = FollowStrategy(df=df_m5, symbol=symbol, verbose=False)
-            strat.prepare_data()
-            signals_df = strat.run_backtest()
-            if getattr(config, 'LIVE_DEBUG', False) and signals_df.empty:
+            signals_df = self._run_strategy_cached(
+                symbol, (df_m5,), lambda: FollowStrategy(df=df_m5, symbol=symbol, verbose=False)
+            )
+            if live_debug and signals_df.empty:
                 print(f"[LIVE_DEBUG] follow: 0 signals")
         elif self.strategy_name == 'test-sl':
             cli_mt5 = config.cli_symbol_to_mt5(self.cli_symbol) if self.cli_symbol else None
-            test_symbols = list(dict.fromkeys([
-                s for s in [cli_mt5, symbol, 'XAUUSD', 'XAUUSDm'] if s
-            ]))
+            test_symbols = self._symbol_candidates([cli_mt5, symbol, 'XAUUSD', 'XAUUSDm'])
             tick = None
             for sym in test_symbols:
                 tick = self.mt5.get_live_price(sym)
@@ -381,11 +467,11 @@ class LiveTradingEngine:
             return []
         if signals_df.empty:
             return []
-        latest_signal = signals_df.iloc[-1].to_dict() if not signals_df.empty else None
+        latest_signal = signals_df.iloc[-1].to_dict()
         if latest_signal:
             tick = self.mt5.get_live_price(symbol)
             if tick is None:
-                if getattr(config, 'LIVE_DEBUG', False):
+                if live_debug:
                     print(f"[LIVE_DEBUG] No live tick for {symbol} - cannot get entry price")
             elif tick:
                 latest_signal['symbol'] = symbol
@@ -464,7 +550,7 @@ class LiveTradingEngine:
                     and self.mt5.connected
                 )
                 if use_dynamic:
-                    account = self.paper.get_account_info() if self.paper_mode else self.mt5.get_account_info()
+                    account = self._get_account_info()
                     balance = account['balance'] if account else 0
                     sl = latest_signal.get('sl')
                     if sl is not None and balance > 0:
@@ -526,10 +612,7 @@ class LiveTradingEngine:
             entry_price = float(entry_price)
         except (TypeError, ValueError):
             return True, None
-        if self.paper_mode:
-            positions = [p for p in self.paper.get_positions() if p.get('symbol') == symbol]
-        else:
-            positions = [p for p in self.mt5.get_positions() if p.get('symbol') == symbol]
+        positions = self._get_positions_for_symbol(symbol)
         if not positions:
             return True, None
         if not getattr(config, 'ALLOW_SAME_SYMBOL_AT_TP', True):
@@ -582,7 +665,7 @@ class LiveTradingEngine:
                 speak(f"Trade rejected. Reason: {same_symbol_reason}.")
             return None, same_symbol_reason
         if not self.paper_mode and config.USE_MARGIN_CHECK:
-            account_info = self.mt5.get_account_info()
+            account_info = self._get_account_info()
             if account_info:
                 required = self.mt5.calc_required_margin(
                     signal['symbol'], signal['type'], signal['volume'], signal['price']
@@ -602,7 +685,7 @@ class LiveTradingEngine:
                     speak("Trade rejected. Reason: Below confidence threshold.")
                 return None, err
         if config.MANUAL_APPROVAL:
-            account_info = self.paper.get_account_info() if self.paper_mode else self.mt5.get_account_info()
+            account_info = self._get_account_info()
             if not self.approver.request_approval(signal, account_info):
                 print("[REJECTED] Trade not approved by user")
                 if config.VOICE_ALERTS and config.VOICE_ALERT_ON_REJECT:
@@ -637,8 +720,11 @@ class LiveTradingEngine:
                 comment=_comment
             )
         if result:
+            self._positions_by_symbol = None
+            self._account_info = None
             result['time'] = datetime.utcnow()
             self.trades_today.append(result)
+            self._record_trade_count(result)
             if not self.paper_mode and getattr(config, 'LIVE_TRADE_LOG', False):
                 self._log_trade(signal, result)
             if config.VOICE_ALERTS and config.VOICE_ALERT_ON_SIGNAL:
@@ -847,6 +933,10 @@ class LiveTradingEngine:
         self._last_run_errors = []  # Capture why trade wasn't executed
         try:
             while self.running:
+                self._bar_cache.clear()
+                self._positions_by_symbol = None
+                self._account_info = None
+                tick_now = datetime.utcnow()  # one clock for this iteration's day/session limit checks
                 # Pre-check: Algo Trading must be enabled for live orders
                 if not self.paper_mode and not self.mt5.is_algo_trading_enabled():
                     print("\n" + "=" * 50)
@@ -856,7 +946,7 @@ class LiveTradingEngine:
                     print("=" * 50)
                     self.running = False
                     break
-                if not self.check_safety_limits():
+                if not self.check_safety_limits(tick_now):
                     reason = getattr(self, '_limit_reason', 'Trade limit reached')
                     if config.VOICE_ALERTS and config.VOICE_ALERT_ON_REJECT:
                         speak(f"Trade rejected. Reason: {reason}.")
@@ -914,7 +1004,7 @@ class LiveTradingEngine:
                         print(f"[SKIP] Signal within 5 min of last execution (cooldown)")
                         continue
                     if getattr(config, 'MAX_TRADES_PER_DAY_PER_PAIR', False):
-                        can_trade, limit_reason = self._can_trade_symbol(signal.get('symbol', ''))
+                        can_trade, limit_reason = self._can_trade_symbol(signal.get('symbol', ''), tick_now)
                         if not can_trade:
                             print(f"[SKIP] {limit_reason}")
                             continue
@@ -963,7 +1053,7 @@ class LiveTradingEngine:
                         self._record_setup_trade(signal)
                         last_signal_time = datetime.now()
                         if getattr(config, 'TELEGRAM_ENABLED', False):
-                            send_setup_notification(signal, self.strategy_name)
+                            self._notify(send_setup_notification, signal, self.strategy_name)
                         exec_reason = signal.get('reason', '')
                         vol = result.get('volume')
                         risk_str = ""
@@ -1020,4 +1110,5 @@ class LiveTradingEngine:
             self.show_status()
             if self.paper_mode:
                 self.paper.save_session()
+            wait(self._notify_pending, timeout=15)
             print("\nTrading engine stopped.")
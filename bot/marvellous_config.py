@@ -10,11 +10,23 @@ except ImportError:
     config = None
 
 
+# config's namespace, read once: each setting below is then a single dict lookup
+_CONFIG = vars(config) if config else {}
+
+
 def _get(key, default):
     """Get from config or marvellous defaults."""
-    if config and hasattr(config, key):
-        return getattr(config, key)
-    return default
+    return _CONFIG.get(key, default)
+
+
+def _float(key, default):
+    """_get coerced to float (prices, ratios, ATR multipliers)."""
+    return float(_get(key, default))
+
+
+def _int(key, default):
+    """_get coerced to int (bar counts and lookbacks, used for slicing)."""
+    return int(_get(key, default))
 
 
 # Instrument
@@ -27,9 +39,9 @@ REQUIRE_DAILY_BIAS = _get("MARVELLOUS_REQUIRE_DAILY_BIAS", False)
 REQUIRE_H1_ZONE_CONFIRMATION = _get("MARVELLOUS_REQUIRE_H1_ZONE_CONFIRMATION", True)
 REQUIRE_4H_ZONE_CONFIRMATION = _get("MARVELLOUS_REQUIRE_4H_ZONE_CONFIRMATION", True)
 REQUIRE_DAILY_ZONE_CONFIRMATION = _get("MARVELLOUS_REQUIRE_DAILY_ZONE_CONFIRMATION", True)
-LOOKBACK_H1_HOURS = _get("MARVELLOUS_LOOKBACK_H1_HOURS", 48)
-LOOKBACK_4H_BARS = _get("MARVELLOUS_LOOKBACK_4H_BARS", 24)
-LOOKBACK_DAILY_BARS = _get("MARVELLOUS_LOOKBACK_DAILY_BARS", 10)
+LOOKBACK_H1_HOURS = _int("MARVELLOUS_LOOKBACK_H1_HOURS", 48)
+LOOKBACK_4H_BARS = _int("MARVELLOUS_LOOKBACK_4H_BARS", 24)
+LOOKBACK_DAILY_BARS = _int("MARVELLOUS_LOOKBACK_DAILY_BARS", 10)
 REACTION_THRESHOLDS = _get(
     "MARVELLOUS_REACTION_THRESHOLDS",
     {"wick_pct": 0.5, "body_pct": 0.3},
@@ -44,8 +56,8 @@ ENABLE_NEWYORK_SESSION = _get("MARVELLOUS_ENABLE_NEWYORK_SESSION", True)
 
 # News filter settings
 AVOID_NEWS = _get("MARVELLOUS_AVOID_NEWS", True)
-NEWS_BUFFER_BEFORE_MINUTES = _get("MARVELLOUS_NEWS_BUFFER_BEFORE_MINUTES", 15)
-NEWS_BUFFER_AFTER_MINUTES = _get("MARVELLOUS_NEWS_BUFFER_AFTER_MINUTES", 15)
+NEWS_BUFFER_BEFORE_MINUTES = _int("MARVELLOUS_NEWS_BUFFER_BEFORE_MINUTES", 15)
+NEWS_BUFFER_AFTER_MINUTES = _int("MARVELLOUS_NEWS_BUFFER_AFTER_MINUTES", 15)
 MARVELLOUS_NEWS_API = _get("MARVELLOUS_NEWS_API", "investpy")
 MARVELLOUS_NEWS_COUNTRIES = _get(
     "MARVELLOUS_NEWS_COUNTRIES",
@@ -54,12 +66,12 @@ MARVELLOUS_NEWS_COUNTRIES = _get(
 FCSAPI_KEY = _get("FCSAPI_KEY", os.getenv("FCSAPI_KEY"))
 
 # Volatility & spread filter settings
-MIN_ATR_THRESHOLD = _get("MARVELLOUS_MIN_ATR_THRESHOLD", 0.5)
-MAX_SPREAD_POINTS = _get("MARVELLOUS_MAX_SPREAD_POINTS", 50.0)
+MIN_ATR_THRESHOLD = _float("MARVELLOUS_MIN_ATR_THRESHOLD", 0.5)
+MAX_SPREAD_POINTS = _float("MARVELLOUS_MAX_SPREAD_POINTS", 50.0)
 
 # Liquidity map filter settings
 USE_LIQUIDITY_MAP = _get("MARVELLOUS_USE_LIQUIDITY_MAP", True)
-LIQUIDITY_ZONE_STRENGTH_THRESHOLD = _get(
+LIQUIDITY_ZONE_STRENGTH_THRESHOLD = _float(
     "MARVELLOUS_LIQUIDITY_ZONE_STRENGTH_THRESHOLD", 0.5
 )
 
@@ -91,26 +103,32 @@ def _resolve_marvellous_symbols():
 MARVELLOUS_BACKTEST_SYMBOL, MARVELLOUS_LIVE_SYMBOL = _resolve_marvellous_symbols()
 
 # Swing detection
-MARVELLOUS_SWING_LENGTH = _get("MARVELLOUS_SWING_LENGTH", 3)
-MARVELLOUS_OB_LOOKBACK = _get("MARVELLOUS_OB_LOOKBACK", 20)
-MARVELLOUS_LIQ_SWEEP_LOOKBACK = _get("MARVELLOUS_LIQ_SWEEP_LOOKBACK", 5)
-MARVELLOUS_TP_SWING_LOOKAHEAD = _get("MARVELLOUS_TP_SWING_LOOKAHEAD", 3)
+MARVELLOUS_SWING_LENGTH = _int("MARVELLOUS_SWING_LENGTH", 3)
+MARVELLOUS_OB_LOOKBACK = _int("MARVELLOUS_OB_LOOKBACK", 20)
+MARVELLOUS_LIQ_SWEEP_LOOKBACK = _int("MARVELLOUS_LIQ_SWEEP_LOOKBACK", 5)
+MARVELLOUS_TP_SWING_LOOKAHEAD = _int("MARVELLOUS_TP_SWING_LOOKAHEAD", 3)
 MARVELLOUS_ENTRY_WINDOW_HOURS = _get("MARVELLOUS_ENTRY_WINDOW_HOURS", 8)
 MARVELLOUS_ENTRY_WINDOW_MINUTES = _get("MARVELLOUS_ENTRY_WINDOW_MINUTES", 15)
 MARVELLOUS_ONE_SIGNAL_PER_SETUP = _get("MARVELLOUS_ONE_SIGNAL_PER_SETUP", True)
 MARVELLOUS_MAX_TRADES_PER_SETUP = _get("MARVELLOUS_MAX_TRADES_PER_SETUP", None)  # None = unlimited, 1 = one per setup, 3 = up to 3
 
 # SL buffer (gold)
-MARVELLOUS_SL_BUFFER = _get("MARVELLOUS_SL_BUFFER", 1.0)
+MARVELLOUS_SL_BUFFER = _float("MARVELLOUS_SL_BUFFER", 1.0)
 MARVELLOUS_USE_SL_FALLBACK = _get("MARVELLOUS_USE_SL_FALLBACK", True)
-MARVELLOUS_SL_FALLBACK_DISTANCE = _get("MARVELLOUS_SL_FALLBACK_DISTANCE", 5.0)
+MARVELLOUS_SL_FALLBACK_DISTANCE = _float("MARVELLOUS_SL_FALLBACK_DISTANCE", 5.0)
 # SL method: OB = M15 lq_level, HYBRID = swing + ATR buffer (tighter with 1m entry)
-MARVELLOUS_SL_METHOD = _get("MARVELLOUS_SL_METHOD", "OB")
-MARVELLOUS_SL_ATR_MULT = _get("MARVELLOUS_SL_ATR_MULT", 1.0)
+MARVELLOUS_SL_METHOD = _get("MARVELLOUS_SL_METHOD", "OB").upper()
+if MARVELLOUS_SL_METHOD not in ("OB", "HYBRID"):
+    raise ValueError(f"MARVELLOUS_SL_METHOD must be OB or HYBRID, got {MARVELLOUS_SL_METHOD!r}")
+MARVELLOUS_SL_ATR_MULT = _float("MARVELLOUS_SL_ATR_MULT", 1.0)
 MARVELLOUS_SL_MICRO_TF = _get("MARVELLOUS_SL_MICRO_TF", "1m")
+if MARVELLOUS_SL_MICRO_TF not in ("1m", "5m"):
+    raise ValueError(f"MARVELLOUS_SL_MICRO_TF must be 1m or 5m, got {MARVELLOUS_SL_MICRO_TF!r}")
 REQUIRE_BREAKER_BLOCK = _get("MARVELLOUS_REQUIRE_BREAKER_BLOCK", False)
 BREAKER_BLOCK_TF = _get("MARVELLOUS_BREAKER_BLOCK_TF", "H1")
 # Premium/Discount (ICT)
 USE_PREMIUM_DISCOUNT = _get("MARVELLOUS_USE_PREMIUM_DISCOUNT", False)
-EQUILIBRIUM_LOOKBACK = _get("MARVELLOUS_EQUILIBRIUM_LOOKBACK", 24)
+EQUILIBRIUM_LOOKBACK = _int("MARVELLOUS_EQUILIBRIUM_LOOKBACK", 24)
 EQUILIBRIUM_TF = _get("MARVELLOUS_EQUILIBRIUM_TF", "H1").upper()  # H1, 4H, or DAILY
+if EQUILIBRIUM_TF not in ("H1", "4H", "DAILY"):
+    raise ValueError(f"MARVELLOUS_EQUILIBRIUM_TF must be H1, 4H or DAILY, got {EQUILIBRIUM_TF!r}")
@@ -259,6 +259,15 @@ class MT5Connector:
             'trade_tick_value': getattr(info, 'trade_tick_value', 0),
         }
 
+    def get_symbol_names(self):
+        """Return the set of symbol names the broker offers (one symbols_get call), or None if unavailable."""
+        if not self.connected:
+            return None
+        symbols = mt5.symbols_get()
+        if not symbols:
+            return None
+        return {s.name for s in symbols}
+
     def calc_lot_size_from_risk(self, symbol, balance, entry_price, sl_price, risk_pct):
         """
         Calculate lot size so that risk = balance * risk_pct (matches backtest).
@@ -9,10 +9,11 @@ from ai import get_signal_confidence, explain_trade, speak
 
 
 def _strip_tz(df):
+    """Return df with a tz-naive index (shallow copy: OHLC columns are shared, only the index changes)."""
     if df is None or df.empty:
         return df
     if df.index.tz is not None:
-        df = df.copy()
+        df = df.copy(deep=False)
         df.index = df.index.tz_convert(None)
     return df
 
@@ -48,8 +49,9 @@ def load_replay_data(strategy_name, symbol, csv_path):
                 df_entry = df_m15.copy()
             else:
                 df_entry = fetch_data_yfinance(symbol, period=fetch_period, interval='1m' if entry_tf == '1m' else '5m')
-        for d in (df_daily, df_4h, df_h1, df_m15, df_entry):
-            _strip_tz(d)
+        df_daily, df_4h, df_h1, df_m15, df_entry = (
+            _strip_tz(d) for d in (df_daily, df_4h, df_h1, df_m15, df_entry)
+        )
         return df_entry, {'df_daily': df_daily, 'df_4h': df_4h, 'df_h1': df_h1, 'df_m15': df_m15, 'df_entry': df_entry, 'symbol': symbol}
 
     if strategy_name == 'vester':
@@ -66,8 +68,7 @@ def load_replay_data(strategy_name, symbol, csv_path):
             df_m5 = fetch_data_yfinance(symbol, period=fetch_period, interval='5m')
             df_m1 = fetch_data_yfinance(symbol, period=fetch_period, interval='1m')
         df_h4 = df_h1.resample('4h').agg(agg).dropna()
-        for d in (df_h1, df_m5, df_m1, df_h4):
-            _strip_tz(d)
+        df_h1, df_m5, df_m1, df_h4 = (_strip_tz(d) for d in (df_h1, df_m5, df_m1, df_h4))
         return df_m1, {'df_h1': df_h1, 'df_m5': df_m5, 'df_m1': df_m1, 'df_h4': df_h4, 'symbol': symbol}
 
     raise ValueError(f"Unknown strategy: {strategy_name}")
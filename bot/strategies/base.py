@@ -2,6 +2,8 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+import numpy as np
+
 
 class BaseStrategy(ABC):
     """Abstract base class for strategies. Requires prepare_data() and run_backtest()."""
@@ -15,3 +17,50 @@ class BaseStrategy(ABC):
     def run_backtest(self):
         """Run backtest; returns DataFrame of signals (time, type, price, sl, tp, reason)."""
         pass
+
+
+def _bars_up_to(df, ts):
+    """Rows of df with index <= ts. Binary search on a sorted index (positional slice), boolean mask otherwise."""
+    index = df.index
+    if index.is_monotonic_increasing:
+        return df.iloc[:index.searchsorted(ts, side="right")]
+    return df[index <= ts]
+
+
+def _bars_window(df, start, end, include_start=True):
+    """Rows of df with start <= index <= end (start < index when include_start is False)."""
+    index = df.index
+    if index.is_monotonic_increasing:
+        lo = index.searchsorted(start, side="left" if include_start else "right")
+        return df.iloc[lo:index.searchsorted(end, side="right")]
+    after_start = index >= start if include_start else index > start
+    return df[after_start & (index <= end)]
+
+
+def _bars_before(df, ts):
+    """Rows of df with index < ts."""
+    index = df.index
+    if index.is_monotonic_increasing:
+        return df.iloc[:index.searchsorted(ts, side="left")]
+    return df[index < ts]
+
+
+def _bars_after(df, ts):
+    """Rows of df with index > ts."""
+    index = df.index
+    if index.is_monotonic_increasing:
+        return df.iloc[index.searchsorted(ts, side="right"):]
+    return df[index > ts]
+
+
+def _flagged_rows(df, flag_col):
+    """Rows where the boolean column flag_col is set (e.g. the swing bars of a prepared frame)."""
+    return df.iloc[np.flatnonzero(df[flag_col].to_numpy(dtype=bool))]
+
+
+def _last_flagged_price(df, flag_col, price_col):
+    """price_col of the last row with flag_col set, as a float; None if no row is flagged."""
+    hits = np.flatnonzero(df[flag_col].to_numpy(dtype=bool))
+    if len(hits) == 0:
+        return None
+    return float(df[price_col].iloc[hits[-1]])
@@ -14,11 +14,13 @@ from ..indicators import detect_fvg, get_equilibrium, get_equilibrium_from_daily
 from ..indicators_bos import (
     detect_swing_highs_lows,
     detect_break_of_structure,
+    detect_swings_and_bos,
     identify_order_block,
     detect_shallow_tap,
     detect_breaker_block,
 )
 from ..news_filter import is_news_safe
+from .base import _bars_after, _bars_before, _bars_up_to, _bars_window, _flagged_rows, _last_flagged_price
 
 
 def _atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -338,8 +340,7 @@ class MarvellousStrategy:
             if df is None or df.empty:
                 continue
             self._log(f"Detecting swing/BOS/FVG on {name}...")
-            df = detect_swing_highs_lows(df, swing_length=swing_len)
-            df = detect_break_of_structure(df)
+            df = detect_swings_and_bos(df, swing_length=swing_len)
             df = detect_fvg(df)
             if name == "Daily":
                 self.df_daily = df
@@ -377,6 +378,12 @@ class MarvellousStrategy:
         sl_method = getattr(mc, "MARVELLOUS_SL_METHOD", "OB")
         sl_atr_mult = getattr(mc, "MARVELLOUS_SL_ATR_MULT", 1.0)
         sl_micro_tf = getattr(mc, "MARVELLOUS_SL_MICRO_TF", "1m")
+        use_premium_discount = getattr(mc, "USE_PREMIUM_DISCOUNT", False)
+        eq_lookback = getattr(mc, "EQUILIBRIUM_LOOKBACK", 24)
+        eq_tf = getattr(mc, "EQUILIBRIUM_TF", "H1").upper()
+        # M15 swing bars, filtered once; sweep levels and swing TPs are binary-searched in these per bar
+        m15_swing_highs = _flagged_rows(self.df_m15, "swing_high")
+        m15_swing_lows = _flagged_rows(self.df_m15, "swing_low")
         entry_tf = getattr(mc, "ENTRY_TIMEFRAME", "5m")
         agg = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
         pip = 0.01 if ("XAU" in str(self.symbol or "") or "GC" in str(self.symbol or "")) else 0.0001
@@ -386,7 +393,7 @@ class MarvellousStrategy:
             current_time = idx if hasattr(idx, "hour") else pd.Timestamp(idx)
 
             # 1. Bias
-            df_h1_slice = self.df_h1[self.df_h1.index <= idx].tail(mc.LOOKBACK_H1_HOURS)
+            df_h1_slice = _bars_up_to(self.df_h1, idx).tail(mc.LOOKBACK_H1_HOURS)
             h1_res = calculate_h1_bias_with_zone_validation(
                 df_h1_slice,
                 mc.LOOKBACK_H1_HOURS,
@@ -396,7 +403,7 @@ class MarvellousStrategy:
             )
             h4_res = None
             if self.df_4h is not None and mc.REQUIRE_4H_BIAS:
-                df_4h_slice = self.df_4h[self.df_4h.index <= idx].tail(mc.LOOKBACK_4H_BARS)
+                df_4h_slice = _bars_up_to(self.df_4h, idx).tail(mc.LOOKBACK_4H_BARS)
                 h4_res = calculate_4h_bias_with_zone_validation(
                     df_4h_slice,
                     mc.LOOKBACK_4H_BARS,
@@ -406,7 +413,7 @@ class MarvellousStrategy:
                 )
             daily_res = None
             if self.df_daily is not None and mc.REQUIRE_DAILY_BIAS:
-                df_d_slice = self.df_daily[self.df_daily.index <= idx].tail(mc.LOOKBACK_DAILY_BARS)
+                df_d_slice = _bars_up_to(self.df_daily, idx).tail(mc.LOOKBACK_DAILY_BARS)
                 daily_res = calculate_daily_bias_with_ict_rules_and_zone_validation(
                     df_d_slice,
                     mc.LOOKBACK_DAILY_BARS,
@@ -420,14 +427,12 @@ class MarvellousStrategy:
             if overall_bias == "NEUTRAL":
                 continue
 
-            if getattr(mc, "USE_PREMIUM_DISCOUNT", False):
-                eq_lookback = getattr(mc, "EQUILIBRIUM_LOOKBACK", 24)
-                eq_tf = getattr(mc, "EQUILIBRIUM_TF", "H1").upper()
+            if use_premium_discount:
                 if eq_tf == "DAILY" and self.df_daily is not None and not self.df_daily.empty:
                     equilibrium = get_equilibrium_from_daily(self.df_daily, current_time)
                 else:
                     df_eq = self.df_h1 if eq_tf == "H1" else (self.df_4h if self.df_4h is not None and not self.df_4h.empty else self.df_h1)
-                    df_eq_slice = df_eq[df_eq.index <= idx].tail(eq_lookback)
+                    df_eq_slice = _bars_up_to(df_eq, idx).tail(eq_lookback)
                     equilibrium = get_equilibrium(df_eq_slice, eq_lookback)
                 if equilibrium is not None:
                     current_close = float(entry_df.iloc[i]["close"])
@@ -451,11 +456,11 @@ class MarvellousStrategy:
                 ):
                     continue
                 if mc.USE_LIQUIDITY_MAP:
-                    entry_slice = entry_df[entry_df.index <= idx]
+                    entry_slice = _bars_up_to(entry_df, idx)
                     if not is_liquidity_map_valid(
                         entry_slice,
                         mc.LIQUIDITY_ZONE_STRENGTH_THRESHOLD,
-                        atr_series[atr_series.index <= idx] if atr_series is not None else None,
+                        _bars_up_to(atr_series, idx) if atr_series is not None else None,
                     ):
                         continue
                 atr_val = atr_series.iloc[i] if i < len(atr_series) and atr_series is not None else None
@@ -465,14 +470,14 @@ class MarvellousStrategy:
 
             # 6. Lower-TF zone + structure + sweep + entry
             row = entry_df.iloc[i]
-            h1_slice = self.df_h1[self.df_h1.index <= idx].tail(24)
+            h1_slice = _bars_up_to(self.df_h1, idx).tail(24)
             if h1_slice.empty:
                 continue
             h1_last = h1_slice.iloc[-1]
             h1_bias = "BULLISH" if h1_last.get("bos_bull") else ("BEARISH" if h1_last.get("bos_bear") else None)
             if h1_bias is None:
                 continue
-            m15_slice = self.df_m15[(self.df_m15.index <= idx) & (self.df_m15.index > idx - pd.Timedelta(hours=window_hours))]
+            m15_slice = _bars_window(self.df_m15, idx - pd.Timedelta(hours=window_hours), idx, include_start=False)
             if m15_slice.empty:
                 continue
             m15_bos_seen = False
@@ -518,18 +523,14 @@ class MarvellousStrategy:
 
                 if not lq_swept:
                     if h1_bias == "BULLISH":
-                        recent_highs = self.df_m15[
-                            (self.df_m15.index < m15_idx) & (self.df_m15["swing_high"] == True)
-                        ].tail(liq_lookback)
+                        recent_highs = _bars_before(m15_swing_highs, m15_idx).tail(liq_lookback)
                         if not recent_highs.empty:
                             liq_high = recent_highs.iloc[-1]["swing_high_price"]
                             if m15_row["high"] > liq_high:
                                 lq_swept = True
                                 lq_level = m15_row["low"]
                     elif h1_bias == "BEARISH":
-                        recent_lows = self.df_m15[
-                            (self.df_m15.index < m15_idx) & (self.df_m15["swing_low"] == True)
-                        ].tail(liq_lookback)
+                        recent_lows = _bars_before(m15_swing_lows, m15_idx).tail(liq_lookback)
                         if not recent_lows.empty:
                             liq_low = recent_lows.iloc[-1]["swing_low_price"]
                             if m15_row["low"] < liq_low:
@@ -588,17 +589,17 @@ class MarvellousStrategy:
                         if sl_method == "HYBRID":
                             micro_df = None
                             if sl_micro_tf == "1m" and entry_tf == "1m":
-                                micro_df = entry_df[entry_df.index <= idx]
+                                micro_df = _bars_up_to(entry_df, idx)
                             elif sl_micro_tf == "5m":
                                 if entry_tf == "5m":
-                                    micro_df = entry_df[entry_df.index <= idx]
+                                    micro_df = _bars_up_to(entry_df, idx)
                                 elif entry_tf == "1m":
-                                    entry_slice = entry_df[entry_df.index <= idx]
+                                    entry_slice = _bars_up_to(entry_df, idx)
                                     micro_df = entry_slice.resample("5min").agg(agg).dropna()
                                     if not micro_df.empty:
                                         micro_df = detect_swing_highs_lows(micro_df, swing_length=mc.MARVELLOUS_SWING_LENGTH)
                                 elif entry_tf == "15m":
-                                    m15_slice = self.df_m15[self.df_m15.index <= idx]
+                                    m15_slice = _bars_up_to(self.df_m15, idx)
                                     micro_df = m15_slice.resample("5min").agg(agg).ffill().dropna()
                                     if not micro_df.empty:
                                         micro_df = detect_swing_highs_lows(micro_df, swing_length=mc.MARVELLOUS_SWING_LENGTH)
@@ -610,25 +611,21 @@ class MarvellousStrategy:
                                 atr_val = float(atr_val) if not pd.isna(atr_val) and atr_val > 0 else (row["high"] - row["low"]) * 2
                                 buf = atr_val * sl_atr_mult
                                 if h1_bias == "BULLISH":
-                                    swing_lows = micro_df[micro_df["swing_low"] == True]
-                                    if not swing_lows.empty:
-                                        base_swing = float(swing_lows.iloc[-1]["swing_low_price"])
+                                    base_swing = _last_flagged_price(micro_df, "swing_low", "swing_low_price")
+                                    if base_swing is not None:
                                         sl = base_swing - buf
                                         if sl >= entry_price:
                                             sl = entry_price - pip
                                 else:
-                                    swing_highs = micro_df[micro_df["swing_high"] == True]
-                                    if not swing_highs.empty:
-                                        base_swing = float(swing_highs.iloc[-1]["swing_high_price"])
+                                    base_swing = _last_flagged_price(micro_df, "swing_high", "swing_high_price")
+                                    if base_swing is not None:
                                         sl = base_swing + buf
                                         if sl <= entry_price:
                                             sl = entry_price + pip
                         if h1_bias == "BULLISH":
                             is_bull = row["close"] > row["open"]
                             if is_bull and float(lq_level) < float(row["close"]):
-                                future_highs = self.df_m15[
-                                    (self.df_m15.index > idx) & (self.df_m15["swing_high"] == True)
-                                ].head(tp_lookahead)
+                                future_highs = _bars_after(m15_swing_highs, idx).head(tp_lookahead)
                                 tp_price = future_highs.iloc[0]["swing_high_price"] if not future_highs.empty else None
                                 sig = {
                                     "time": idx,
@@ -647,9 +644,7 @@ class MarvellousStrategy:
                         elif h1_bias == "BEARISH":
                             is_bear = row["close"] < row["open"]
                             if is_bear and float(lq_level) > float(row["close"]):
-                                future_lows = self.df_m15[
-                                    (self.df_m15.index > idx) & (self.df_m15["swing_low"] == True)
-                                ].head(tp_lookahead)
+                                future_lows = _bars_after(m15_swing_lows, idx).head(tp_lookahead)
                                 tp_price = future_lows.iloc[0]["swing_low_price"] if not future_lows.empty else None
                                 sig = {
                                     "time": idx,
@@ -9,15 +9,14 @@ from datetime import datetime
 
 import config
 from .. import vester_config as vc
-from ..indicators import detect_fvg, detect_rejection_candle, detect_displacement, get_equilibrium
+from ..indicators import detect_fvg, detect_candle_patterns, get_equilibrium
 from ..indicators_bos import (
-    detect_swing_highs_lows,
-    detect_break_of_structure,
+    detect_swings_and_bos,
     identify_order_block,
     detect_breaker_block,
 )
 from ..news_filter import is_news_safe
-from .base import BaseStrategy
+from .base import BaseStrategy, _bars_after, _bars_up_to, _bars_window, _flagged_rows, _last_flagged_price
 
 
 def _atr(df: pd.DataFrame, period: int = 14) -> pd.Series:
@@ -41,18 +40,20 @@ def _price_in_zone(bar_low: float, bar_high: float, zone_top: float, zone_bottom
 
 def _get_fvg_zones(df: pd.DataFrame, start_idx: int, end_idx: int) -> List[Tuple[float, float, str]]:
     """Return list of (zone_top, zone_bottom, direction) for FVGs in range. Bullish FVG: c3_low > c1_high -> zone = [c1_high, c3_low]."""
-    zones = []
-    for i in range(max(2, start_idx), min(end_idx, len(df) - 1)):
-        row = df.iloc[i]
-        if row.get("fvg_bull"):
-            zone_bottom = df.iloc[i - 2]["high"]
-            zone_top = row["low"]
-            zones.append((zone_top, zone_bottom, "BULLISH"))
-        if row.get("fvg_bear"):
-            zone_top = df.iloc[i - 2]["low"]
-            zone_bottom = row["high"]
-            zones.append((zone_top, zone_bottom, "BEARISH"))
-    return zones
+    lo, hi = max(2, start_idx), min(end_idx, len(df) - 1)
+    if hi <= lo:
+        return []
+    highs = df["high"].to_numpy()
+    lows = df["low"].to_numpy()
+    empty = np.empty(0, dtype=np.int64)
+    bull = np.flatnonzero(df["fvg_bull"].to_numpy(dtype=bool)[lo:hi]) + lo if "fvg_bull" in df.columns else empty
+    bear = np.flatnonzero(df["fvg_bear"].to_numpy(dtype=bool)[lo:hi]) + lo if "fvg_bear" in df.columns else empty
+    # Bar order, bullish before bearish on the same bar (as the per-row scan emitted them)
+    order = np.argsort(np.concatenate([bull * 2, bear * 2 + 1]), kind="stable")
+    tops = np.concatenate([lows[bull], lows[bear - 2]])[order]
+    bottoms = np.concatenate([highs[bull - 2], highs[bear]])[order]
+    directions = np.array(["BULLISH"] * len(bull) + ["BEARISH"] * len(bear), dtype=object)[order]
+    return list(zip(tops.tolist(), bottoms.tolist(), directions.tolist()))
 
 
 class VesterStrategy(BaseStrategy):
@@ -92,11 +93,10 @@ class VesterStrategy(BaseStrategy):
             if df is None or df.empty:
                 continue
             self._log(f"Vester: Detecting swing/BOS/FVG/rejection/displacement on {name}...")
-            df = detect_swing_highs_lows(df, swing_length=swing_len)
-            df = detect_break_of_structure(df)
-            df = detect_fvg(df)
-            df = detect_rejection_candle(df, wick_ratio=vc.REJECTION_WICK_RATIO)
-            df = detect_displacement(df, threshold=1.5, window=10)
+            df = detect_swings_and_bos(df, swing_length=swing_len)
+            df = detect_candle_patterns(
+                df, wick_ratio=vc.REJECTION_WICK_RATIO, displacement_threshold=1.5, displacement_window=10
+            )
             setattr(self, df_ref, df)
         return self.df_h1, self.df_m5, self.df_m1
 
@@ -295,37 +295,26 @@ class VesterStrategy(BaseStrategy):
 
         end = end_idx if end_idx is not None else len(df)
         start = max(0, end - lookback * 10)
+        if direction == "BUY":
+            flag_col, price_col = "swing_low", "swing_low_price"
+        else:
+            flag_col, price_col = "swing_high", "swing_high_price"
 
+        # Last swing in [start, end), then the first later bar that wicks through it and closes back
+        swings = np.flatnonzero(df[flag_col].to_numpy(dtype=bool)[start:end])
+        if len(swings) == 0:
+            return False, None, None
+        last_swing_pos = start + int(swings[-1])
+        liq_level = float(df[price_col].iloc[last_swing_pos])
+        lows = df["low"].to_numpy(dtype=float)[last_swing_pos + 1:end]
+        highs = df["high"].to_numpy(dtype=float)[last_swing_pos + 1:end]
+        closes = df["close"].to_numpy(dtype=float)[last_swing_pos + 1:end]
         if direction == "BUY":
-            last_swing_pos = None
-            liq_level = None
-            for j in range(start, end):
-                if df.iloc[j].get("swing_low"):
-                    last_swing_pos = j
-                    liq_level = df.iloc[j]["swing_low_price"]
-            if last_swing_pos is None or liq_level is None:
-                return False, None, None
-            for i in range(last_swing_pos + 1, end):
-                if i >= len(df):
-                    break
-                r = df.iloc[i]
-                if r["low"] < liq_level and r["close"] > liq_level:
-                    return True, float(liq_level), i
+            hits = np.flatnonzero((lows < liq_level) & (closes > liq_level))
         else:
-            last_swing_pos = None
-            liq_level = None
-            for j in range(start, end):
-                if df.iloc[j].get("swing_high"):
-                    last_swing_pos = j
-                    liq_level = df.iloc[j]["swing_high_price"]
-            if last_swing_pos is None or liq_level is None:
-                return False, None, None
-            for i in range(last_swing_pos + 1, end):
-                if i >= len(df):
-                    break
-                r = df.iloc[i]
-                if r["high"] > liq_level and r["close"] < liq_level:
-                    return True, float(liq_level), i
+            hits = np.flatnonzero((highs > liq_level) & (closes < liq_level))
+        if len(hits):
+            return True, liq_level, last_swing_pos + 1 + int(hits[0])
         return False, None, None
 
     def detectFVG(self, df: pd.DataFrame) -> pd.DataFrame:
@@ -349,15 +338,18 @@ class VesterStrategy(BaseStrategy):
         if df is None or df.empty:
             return None, None
         end = end_idx if end_idx is not None else len(df)
-        for i in range(end - 1, max(0, end - 50), -1):
-            if i < 0:
-                break
-            row = df.iloc[i]
-            if row.get("bos_bull"):
-                return "BULLISH", i
-            if row.get("bos_bear"):
-                return "BEARISH", i
-        return None, None
+        lo = max(0, end - 50) + 1
+        if end <= lo:
+            return None, None
+        # Most recent BOS bar in the last 49 bars (bar 0 of the frame is never considered)
+        no_bos = np.zeros(end - lo, dtype=bool)
+        bull = df["bos_bull"].to_numpy(dtype=bool)[lo:end] if "bos_bull" in df.columns else no_bos
+        bear = df["bos_bear"].to_numpy(dtype=bool)[lo:end] if "bos_bear" in df.columns else no_bos
+        hits = np.flatnonzero(bull | bear)
+        if len(hits) == 0:
+            return None, None
+        k = int(hits[-1])
+        return ("BULLISH" if bull[k] else "BEARISH"), lo + k
 
     def checkEntryTrigger(
         self,
@@ -465,7 +457,26 @@ class VesterStrategy(BaseStrategy):
         if max_per_setup is None:
             max_per_setup = 1 if getattr(vc, "VESTER_ONE_SIGNAL_PER_SETUP", True) else None
         trades_per_5m_setup: Dict = {}
+        # 5M FVG zones per window (first bar, last bar, length): consecutive 1M bars share the same 5M slice
+        fvg_zone_cache: Dict[Tuple, List[Tuple[float, float, str]]] = {}
         apply_limits = getattr(config, "BACKTEST_APPLY_TRADE_LIMITS", False)
+        if apply_limits:
+            max_per_day = getattr(config, "BACKTEST_MAX_TRADES_PER_DAY", config.MAX_TRADES_PER_DAY)
+            max_per_session = getattr(config, "BACKTEST_MAX_TRADES_PER_SESSION", config.MAX_TRADES_PER_SESSION)
+        # Settings read on every bar, resolved once per run (cli toggles vc.* before calling run_backtest)
+        vester_max_per_session = vc.MAX_TRADES_PER_SESSION
+        daily_loss_cap = config.INITIAL_BALANCE * (vc.DAILY_LOSS_LIMIT_PCT / 100.0)
+        htf_lookback = vc.HTF_LOOKBACK_HOURS
+        require_breaker_block = getattr(vc, "REQUIRE_BREAKER_BLOCK", False)
+        require_4h_bias = getattr(vc, "REQUIRE_4H_BIAS", False)
+        use_premium_discount = getattr(vc, "USE_PREMIUM_DISCOUNT", False)
+        eq_lookback = getattr(vc, "EQUILIBRIUM_LOOKBACK", 24)
+        eq_tf = getattr(vc, "EQUILIBRIUM_TF", "H1").upper()
+        m5_window = pd.Timedelta(hours=getattr(vc, "M5_WINDOW_HOURS", 12))
+        require_5m_sweep = getattr(vc, "REQUIRE_5M_SWEEP", True)
+        # 5M swing bars, filtered once; the next swing after a bar (TP target) is a binary search
+        m5_swing_highs = _flagged_rows(self.df_m5, "swing_high")
+        m5_swing_lows = _flagged_rows(self.df_m5, "swing_low")
 
         for i in range(100, len(entry_df)):
             idx = entry_df.index[i]
@@ -474,20 +485,18 @@ class VesterStrategy(BaseStrategy):
             day_key = current_time.strftime("%Y-%m-%d") if hasattr(current_time, "strftime") else str(current_time.date())
 
             if apply_limits:
-                max_per_day = getattr(config, "BACKTEST_MAX_TRADES_PER_DAY", config.MAX_TRADES_PER_DAY)
-                max_per_session = getattr(config, "BACKTEST_MAX_TRADES_PER_SESSION", config.MAX_TRADES_PER_SESSION)
                 if trades_per_day.get(day_key, 0) >= max_per_day:
                     continue
                 if max_per_session is not None and session_key != "other":
                     if trades_per_session.get(session_key, 0) >= max_per_session:
                         continue
             else:
-                if trades_per_session.get(session_key, 0) >= vc.MAX_TRADES_PER_SESSION:
+                if trades_per_session.get(session_key, 0) >= vester_max_per_session:
                     continue
-            if daily_loss.get(day_key, 0) >= config.INITIAL_BALANCE * (vc.DAILY_LOSS_LIMIT_PCT / 100.0):
+            if daily_loss.get(day_key, 0) >= daily_loss_cap:
                 continue
 
-            df_h1_slice = self.df_h1[self.df_h1.index <= idx].tail(vc.HTF_LOOKBACK_HOURS)
+            df_h1_slice = _bars_up_to(self.df_h1, idx).tail(htf_lookback)
             if df_h1_slice.empty or len(df_h1_slice) < 5:
                 continue
 
@@ -495,16 +504,16 @@ class VesterStrategy(BaseStrategy):
             if bias is None:
                 continue
 
-            if getattr(vc, "REQUIRE_BREAKER_BLOCK", False):
+            if require_breaker_block:
                 bb = detect_breaker_block(df_h1_slice, bias, ob_lookback=vc.OB_LOOKBACK)
                 if bb is None:
                     continue
 
-            if getattr(vc, "REQUIRE_4H_BIAS", False):
+            if require_4h_bias:
                 if self.df_h4 is None or self.df_h4.empty:
                     continue
                 h4_lookback = getattr(vc, "H4_LOOKBACK_BARS", 24)
-                df_h4_slice = self.df_h4[self.df_h4.index <= idx].tail(h4_lookback)
+                df_h4_slice = _bars_up_to(self.df_h4, idx).tail(h4_lookback)
                 if df_h4_slice.empty or len(df_h4_slice) < 5:
                     continue
                 bias_4h, _ = self.detect4HBias(df_h4_slice)
@@ -520,11 +529,9 @@ class VesterStrategy(BaseStrategy):
                     if bb is None:
                         continue
 
-            if getattr(vc, "USE_PREMIUM_DISCOUNT", False):
-                eq_lookback = getattr(vc, "EQUILIBRIUM_LOOKBACK", 24)
-                eq_tf = getattr(vc, "EQUILIBRIUM_TF", "H1").upper()
+            if use_premium_discount:
                 df_eq = self.df_h1 if eq_tf == "H1" else (self.df_h4 if self.df_h4 is not None and not self.df_h4.empty else self.df_h1)
-                df_eq_slice = df_eq[df_eq.index <= idx].tail(eq_lookback)
+                df_eq_slice = _bars_up_to(df_eq, idx).tail(eq_lookback)
                 equilibrium = get_equilibrium(df_eq_slice, eq_lookback)
                 if equilibrium is not None:
                     current_close = float(entry_df.iloc[i]["close"])
@@ -533,13 +540,12 @@ class VesterStrategy(BaseStrategy):
                     if bias == "BEARISH" and current_close < equilibrium:
                         continue
 
-            m5_window = getattr(vc, "M5_WINDOW_HOURS", 12)
-            df_m5_slice = self.df_m5[(self.df_m5.index <= idx) & (self.df_m5.index >= idx - pd.Timedelta(hours=m5_window))]
+            df_m5_slice = _bars_window(self.df_m5, idx - m5_window, idx)
             if df_m5_slice.empty:
                 continue
 
             swept, liq_level, _ = self.detectLiquiditySweep(df_m5_slice, "BUY" if bias == "BULLISH" else "SELL", liq_lookback)
-            if getattr(vc, "REQUIRE_5M_SWEEP", True) and not swept:
+            if require_5m_sweep and not swept:
                 continue
             if not swept:
                 liq_level = None
@@ -555,7 +561,11 @@ class VesterStrategy(BaseStrategy):
             if current_ob is not None:
                 entry_zone_top, entry_zone_bottom = current_ob["high"], current_ob["low"]
             if entry_zone_top is None:
-                zones = _get_fvg_zones(df_m5_slice, 0, len(df_m5_slice))
+                zone_key = (df_m5_slice.index[0], df_m5_slice.index[-1], len(df_m5_slice))
+                zones = fvg_zone_cache.get(zone_key)
+                if zones is None:
+                    zones = _get_fvg_zones(df_m5_slice, 0, len(df_m5_slice))
+                    fvg_zone_cache[zone_key] = zones
                 for zt, zb, zd in reversed(zones):
                     if zd == bias:
                         entry_zone_top, entry_zone_bottom = zt, zb
@@ -571,7 +581,7 @@ class VesterStrategy(BaseStrategy):
                 else:
                     entry_zone_top = float(liq_level) + half
                     entry_zone_bottom = float(liq_level) - half
-            if entry_zone_top is None and not getattr(vc, "REQUIRE_5M_SWEEP", True):
+            if entry_zone_top is None and not require_5m_sweep:
                 bar_row = entry_df.iloc[i]
                 atr_val = atr_series.iloc[i] if i < len(atr_series) and atr_series is not None else np.nan
                 atr_val = float(atr_val) if not pd.isna(atr_val) and atr_val > 0 else (bar_row["high"] - bar_row["low"]) * 2
@@ -620,16 +630,12 @@ class VesterStrategy(BaseStrategy):
                 micro_atr = atr_series if sl_micro_tf == "1m" else atr_m5
                 base_swing = None
                 if bias == "BULLISH":
-                    swing_lows = micro_df[micro_df["swing_low"] == True]
-                    if not swing_lows.empty:
-                        base_swing = float(swing_lows.iloc[-1]["swing_low_price"])
+                    base_swing = _last_flagged_price(micro_df, "swing_low", "swing_low_price")
                 else:
-                    swing_highs = micro_df[micro_df["swing_high"] == True]
-                    if not swing_highs.empty:
-                        base_swing = float(swing_highs.iloc[-1]["swing_high_price"])
+                    base_swing = _last_flagged_price(micro_df, "swing_high", "swing_high_price")
                 if base_swing is not None and micro_atr is not None:
                     if sl_micro_tf == "5m":
-                        m5_up_to = self.df_m5[self.df_m5.index <= idx]
+                        m5_up_to = _bars_up_to(self.df_m5, idx)
                         if not m5_up_to.empty:
                             last_m5_idx = m5_up_to.index[-1]
                             atr_val = atr_m5.loc[last_m5_idx] if last_m5_idx in atr_m5.index else np.nan
@@ -662,14 +668,14 @@ class VesterStrategy(BaseStrategy):
                         sl = entry_price + pip
 
             if bias == "BULLISH":
-                future_highs = self.df_m5[(self.df_m5.index > idx) & (self.df_m5["swing_high"] == True)].head(3)
+                future_highs = _bars_after(m5_swing_highs, idx).head(3)
                 tp = future_highs.iloc[0]["swing_high_price"] if not future_highs.empty else None
                 sl_dist = entry_price - sl
                 min_tp = entry_price + sl_dist * min_rr
                 if tp is None or tp < min_tp:
                     tp = min_tp
             else:
-                future_lows = self.df_m5[(self.df_m5.index > idx) & (self.df_m5["swing_low"] == True)].head(3)
+                future_lows = _bars_after(m5_swing_lows, idx).head(3)
                 tp = future_lows.iloc[0]["swing_low_price"] if not future_lows.empty else None
                 sl_dist = sl - entry_price
                 min_tp = entry_price - sl_dist * min_rr
@@ -53,6 +53,11 @@ def build_parser():
         action="store_true",
         help="Print per-trade log (entry, SL, TP, outcome, bar hit) for backtest.",
     )
+    parser.add_argument(
+        "--yf-cache",
+        action="store_true",
+        help="Backtest/replay: reuse today's cached intraday Yahoo bars (up to 1h old) instead of re-downloading.",
+    )
     parser.add_argument(
         "--compare-breaker-block",
         action="store_true",
@@ -354,6 +359,8 @@ def run(args):
         print("--strategy all is only supported in backtest mode.")
         return
     print(f"Starting ICT Bot in {args.mode} mode with {args.strategy} strategy...")
+    if args.yf_cache:
+        config.YF_CACHE_INTRADAY = True
     if args.mode == "backtest":
         run_backtest(args)
     elif args.mode == "replay":
@@ -50,6 +50,7 @@ BACKTEST_PERIOD = '60d'  # Data period: 12d, 60d, 6mo (set before run)
 BACKTEST_SPREAD_PIPS = 2.0       # e.g. 2.0 for gold, 1.0 for forex
 BACKTEST_COMMISSION_PER_LOT = 7.0  # round-trip per lot (e.g. 7.0)
 BACKTEST_SLIPPAGE_PIPS = 0.5     # e.g. 0.5
+YF_CACHE_INTRADAY = False  # Reuse today's cached intraday Yahoo bars (CLI --yf-cache); daily bars are always cached
 
 # Kill zone hours (UTC) — used by strategies for session filtering
 KILL_ZONE_HOURS = [7, 8, 9, 10, 13, 14, 15, 16]
@@ -95,6 +96,7 @@ LIVE_SYMBOLS = {
 
 # Trading Loop Settings
 LIVE_CHECK_INTERVAL = 15  # Seconds between strategy checks
+LIVE_EVALUATE_ON_BAR_CLOSE = False  # True = re-run the strategy only when a new bar opens (ignores forming-bar moves); False = whenever a bar time or the forming bar's OHLC changed
 # Signal freshness: only take signals where bar time is within last N minutes (avoids stale setups)
 SIGNAL_MAX_AGE_MINUTES = 5   # Default; Vester uses 5M setup, Marvellous uses M15
 VESTER_SIGNAL_MAX_AGE_MINUTES = 15   # 3 × 5M bars (more tolerance for live)
@@ -97,3 +97,212 @@ def test_bar_order_matters_tp_first():
     )
     outcome, pnl = _simulate_trade(100, 98, 106, future, 'BUY', 0.10, 3.0)
     assert outcome == 'WIN'
+
+
+def test_valid_sl_mask_direction_and_missing_values():
+    """SL must sit below entry for BUY, above for SELL; missing/non-numeric SL is rejected."""
+    from bot.backtest.common import _coerce_signal_dtypes, _valid_sl_mask
+    signals = pd.DataFrame([
+        {'type': 'BUY', 'price': 100.0, 'sl': 98.0},
+        {'type': 'BUY', 'price': 100.0, 'sl': 101.0},
+        {'type': 'SELL', 'price': 100.0, 'sl': 102.0},
+        {'type': 'SELL', 'price': 100.0, 'sl': 100.0},
+        {'type': 'BUY', 'price': 100.0, 'sl': None},
+        {'type': 'SELL', 'price': 100.0, 'sl': 'bad'},
+    ])
+    assert _valid_sl_mask(_coerce_signal_dtypes(signals)).tolist() == [True, False, True, False, False, False]
+
+
+def test_scan_outcome_lock_in_and_first_hit():
+    """_scan_outcome: first bar decides; after lock-in trigger an SL hit books lock_in_at R."""
+    import numpy as np
+    from bot.backtest.common import _scan_outcome
+    # BUY entry 100, SL 98 (2 pts), TP 110, lock-in trigger 106.6 -> SL to 106
+    highs = np.array([101.0, 107.0, 106.5])
+    lows = np.array([99.0, 104.0, 105.5])
+    pos, outcome, rr = _scan_outcome(highs, lows, True, 98.0, 110.0, 106.0, 106.6, 3.0, 5.0)
+    assert (pos, outcome, rr) == (1, 'WIN', 3.0)
+    # Same bars without lock-in: nothing hit
+    assert _scan_outcome(highs, lows, True, 98.0, 110.0, None, None, 3.0, 5.0) == (None, None, 5.0)
+    # SELL: SL checked before TP on the same bar
+    pos, outcome, rr = _scan_outcome(np.array([103.0]), np.array([90.0]), False, 102.0, 94.0, None, None, 3.0, 5.0)
+    assert (pos, outcome, rr) == (0, 'LOSS', 0.0)
+
+
+def test_first_hit_kernel_matches_numpy_scan(monkeypatch):
+    """_first_hit (numba or pure Python) returns the same outcomes as the NumPy _scan_outcome fallback."""
+    import numpy as np
+    from bot.backtest import common
+    rng = np.random.default_rng(7)
+    closes = 100 + np.cumsum(rng.normal(0, 0.3, 400))
+    highs = closes + rng.uniform(0, 0.4, 400)
+    lows = closes - rng.uniform(0, 0.4, 400)
+    cases = []
+    for start in range(0, 300, 30):
+        for is_buy in (True, False):
+            for lock in (True, False):
+                sign = 1 if is_buy else -1
+                entry = closes[start]
+                sl, tp = entry - sign * 0.5, entry + sign * 2.5
+                lock_sl = entry + sign * 1.5 if lock else None
+                trigger = entry + sign * 1.65 if lock else None
+                cases.append((is_buy, sl, tp, lock_sl, trigger))
+    expected = []
+    monkeypatch.setattr(common, "_first_hit", common._first_hit_np)
+    for is_buy, sl, tp, lock_sl, trigger in cases:
+        expected.append(common._scan_outcome(highs, lows, is_buy, sl, tp, lock_sl, trigger, 3.0, 5.0))
+    monkeypatch.undo()
+    for (is_buy, sl, tp, lock_sl, trigger), exp in zip(cases, expected):
+        use_lock = lock_sl is not None
+        pos, code = common._first_hit_py(highs, lows, 0, 1.0 if is_buy else -1.0, sl, tp, use_lock, lock_sl or 0.0, trigger or 0.0)
+        assert common._decode_outcome(pos, code, sl, lock_sl, 3.0, 5.0) == exp
+        assert common._scan_outcome(highs, lows, is_buy, sl, tp, lock_sl, trigger, 3.0, 5.0) == exp
+
+
+def test_resolve_trade_outcomes_batch():
+    """_resolve_trade_outcomes: closed trades only, missing TP falls back to the RR target."""
+    import numpy as np
+    from bot.backtest.common import _resolve_trade_outcomes
+    idx = pd.date_range('2025-01-06 10:00', periods=4, freq='1min')
+    highs = np.array([100.5, 101.0, 106.0, 100.0])
+    lows = np.array([99.5, 99.8, 100.5, 98.0])
+    signals = pd.DataFrame([
+        {'time': idx[0], 'type': 'BUY', 'price': 100.0, 'sl': 99.0, 'tp': None, 'reason': 'a'},
+        {'time': idx[0], 'type': 'SELL', 'price': 100.0, 'sl': 100.9, 'tp': 99.0, 'reason': 'b'},
+        {'time': idx[3], 'type': 'BUY', 'price': 100.0, 'sl': 99.0, 'tp': 105.0, 'reason': 'c'},
+    ])
+    trades = _resolve_trade_outcomes(signals, 'EURUSD=X', idx, highs, lows, 5.0, False, 3.3, 3.0)
+    assert list(trades['reason']) == ['a', 'b']
+    assert list(trades['outcome']) == ['WIN', 'LOSS']
+    assert trades['tp'].iloc[0] == pytest.approx(105.0, abs=0.01)
+    assert trades['bar_time'].iloc[0] == idx[2]
+
+
+def test_apply_backtest_realism_vec_matches_scalar():
+    """Vectorized realism gives the same entry/SL as the scalar wrapper for BUY and SELL."""
+    import numpy as np
+    from bot.backtest.common import _apply_backtest_realism, _apply_backtest_realism_vec
+    entries = np.array([1.1000, 1.2000])
+    sls = np.array([1.0950, 1.2050])
+    adj_entry, adj_sl, _ = _apply_backtest_realism_vec(entries, sls, np.array(['BUY', 'SELL']), 'EURUSD=X')
+    for k, order_type in enumerate(('BUY', 'SELL')):
+        e, s, _ = _apply_backtest_realism(entries[k], sls[k], order_type, 'EURUSD=X')
+        assert adj_entry[k] == pytest.approx(e)
+        assert adj_sl[k] == pytest.approx(s)
+
+
+def test_resample_cached_reuses_result_for_same_frame():
+    """_resample_cached returns the cached H4 frame for the same H1 input, a fresh one for a new frame."""
+    import numpy as np
+    from bot.backtest.common import _resample_cached
+    idx = pd.date_range('2025-01-06', periods=48, freq='1h')
+    df_h1 = pd.DataFrame({'open': 1.0, 'high': np.arange(48.0), 'low': 0.0, 'close': 1.0, 'volume': 1.0}, index=idx)
+    h4 = _resample_cached(df_h1, "4h")
+    assert len(h4) == 12
+    assert h4['high'].iloc[0] == 3.0
+    assert _resample_cached(df_h1, "4h") is h4
+    assert _resample_cached(df_h1.copy(), "4h") is not h4
+
+
+def test_strip_tz_returns_naive_frame_without_touching_input():
+    """_strip_tz returns a tz-naive (UTC) frame; the caller's tz-aware frame is left as is."""
+    from bot.backtest.common import _strip_tz
+    idx = pd.date_range('2025-01-06 09:00', periods=3, freq='1h', tz='America/New_York')
+    df = pd.DataFrame({'close': [1.0, 2.0, 3.0]}, index=idx)
+    out = _strip_tz(df)
+    assert out.index.tz is None
+    assert out.index[0] == pd.Timestamp('2025-01-06 14:00')
+    assert df.index.tz is not None
+    assert _strip_tz(df, localize=True).index[0] == pd.Timestamp('2025-01-06 09:00')
+    assert _strip_tz(None) is None
+
+
+def _stub_follow_strategy(monkeypatch, signals):
+    """Make run_follow_backtest use fixed signals (or signals(df) of the runner's M5 frame) instead of FollowStrategy's."""
+    from bot.backtest import backtest_follow
+
+    class FakeFollow:
+        def __init__(self, df, symbol, verbose):
+            self.df = df
+
+        def prepare_data(self):
+            pass
+
+        def run_backtest(self):
+            return signals(self.df) if callable(signals) else signals.copy()
+
+    monkeypatch.setattr(backtest_follow, "FollowStrategy", FakeFollow)
+
+
+def test_follow_runner_stats_report_final_balance_and_return(monkeypatch):
+    """run_follow_backtest(return_stats=True) reports the folded balance as final_balance and return % from it."""
+    import config
+    from bot.backtest import backtest_follow
+    from bot.backtest.common import _resolve_trade_outcomes, _calc_trade_pnl, _bar_arrays
+    idx = pd.date_range('2025-01-06 10:00', periods=6, freq='5min')
+    df_m5 = pd.DataFrame({
+        'open': 2000.0, 'close': 2000.0, 'volume': 1.0,
+        'high': [2000.5, 2001.0, 2030.0, 2000.5, 2000.5, 2012.0],
+        'low': [1999.5, 1999.0, 1999.5, 1999.5, 1999.5, 1999.5],
+    }, index=idx)
+    signals = pd.DataFrame([
+        {'time': idx[0], 'type': 'BUY', 'price': 2000.0, 'sl': 1995.0, 'tp': 2025.0, 'reason': 'win'},
+        {'time': idx[3], 'type': 'SELL', 'price': 2000.0, 'sl': 2010.0, 'tp': 1950.0, 'reason': 'loss'},
+    ])
+    _stub_follow_strategy(monkeypatch, signals)
+    d = backtest_follow.run_follow_backtest(df_m5=df_m5, return_stats=True)
+
+    risk = getattr(config, "RISK_REWARD_RATIO", 5.0)
+    trades = _resolve_trade_outcomes(
+        signals, "GC=F", *_bar_arrays(df_m5), risk,
+        getattr(config, "LOCK_IN_ENABLED", True), getattr(config, "LOCK_IN_TRIGGER_RR", 3.3),
+        getattr(config, "LOCK_IN_AT_RR", 3.0),
+    )
+    balance = config.INITIAL_BALANCE
+    for t in trades.itertuples(index=False):
+        pnl = _calc_trade_pnl("GC=F", balance, getattr(config, "RISK_PER_TRADE", 0.10), t.sl_dist, t.outcome, t.outcome_rr, t.spread_cost)
+        balance += pnl if t.outcome == "WIN" else -pnl
+    assert (d["trades"], d["wins"], d["losses"]) == (2, 1, 1)
+    assert balance != config.INITIAL_BALANCE
+    assert d["final_balance"] == pytest.approx(balance)
+    assert d["return_pct"] == pytest.approx(100.0 * (balance - config.INITIAL_BALANCE) / config.INITIAL_BALANCE)
+    assert d["total_profit"] > 0 and d["total_loss"] > 0
+
+
+def test_follow_runner_keeps_local_wall_time_on_tz_aware_input(monkeypatch):
+    """The follow runner drops the tz without converting: trade times and session labels stay in local wall time."""
+    from bot.backtest import backtest_follow
+    from bot.backtest.common import _day_session_labels
+    idx = pd.date_range('2025-01-06 09:00', periods=4, freq='5min', tz='America/New_York')
+    df_m5 = pd.DataFrame({
+        'open': 2000.0, 'close': 2000.0, 'volume': 1.0,
+        'high': [2000.5, 2001.0, 2030.0, 2000.5], 'low': [1999.5, 1999.0, 1999.5, 1999.5],
+    }, index=idx)
+    _stub_follow_strategy(monkeypatch, lambda df: pd.DataFrame([
+        {'time': df.index[0], 'type': 'BUY', 'price': 2000.0, 'sl': 1995.0, 'tp': 2025.0, 'reason': 'win'},
+    ]))
+    d = backtest_follow.run_follow_backtest(df_m5=df_m5, return_stats=True, include_trade_details=True)
+    trade_time = d["trade_details"][0][0]
+    assert trade_time == pd.Timestamp('2025-01-06 09:00')
+    day, session = _day_session_labels([trade_time])
+    assert (day.iloc[0], session.iloc[0]) == ('2025-01-06', 'london')
+    assert df_m5.index.tz is not None
+
+
+def test_runner_start_refreshes_cached_symbol_constants(monkeypatch):
+    """Config overrides between runs reach the cached per-symbol tuples when the next runner starts."""
+    import config
+    from bot.backtest import backtest_follow
+    from bot.backtest.common import _realism_constants, _clear_symbol_caches, get_pip_size_for_symbol
+    monkeypatch.setattr(config, "BACKTEST_COMMISSION_PER_LOT", 7.0)
+    assert _realism_constants("GC=F")[2] == 7.0
+    monkeypatch.setattr(config, "BACKTEST_COMMISSION_PER_LOT", 3.0)
+    monkeypatch.setattr(config, "get_symbol_config", lambda symbol, key: 0.5 if key == "PIP_SIZE" else None)
+    assert get_pip_size_for_symbol("GC=F") == 0.5
+    _stub_follow_strategy(monkeypatch, pd.DataFrame())
+    idx = pd.date_range('2025-01-06 10:00', periods=2, freq='5min')
+    backtest_follow.run_follow_backtest(df_m5=pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0}, index=idx), return_stats=True)
+    assert _realism_constants("GC=F")[2] == 3.0
+    assert _realism_constants("GC=F")[3] == 0.5
+    monkeypatch.undo()
+    _clear_symbol_caches()
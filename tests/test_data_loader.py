@@ -0,0 +1,104 @@
+"""Unit tests for bot/data_loader.py."""
+import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import data_loader
+
+
+def test_fetch_data_yfinance_batch_collects_frames_and_failures(monkeypatch):
+    """One failing symbol is reported in failures without aborting the other fetches."""
+    calls = []
+
+    def fake_fetch(symbol, period, interval):
+        calls.append((symbol, period, interval))
+        if symbol == "BAD":
+            raise RuntimeError("no data")
+        return pd.DataFrame({"close": [1.0]})
+
+    monkeypatch.setattr(data_loader, "fetch_data_yfinance", fake_fetch)
+    frames, failures = data_loader.fetch_data_yfinance_batch(
+        ["GC=F", "BAD", "EURUSD=X", "GC=F"], period="7d", interval="1h", max_workers=4
+    )
+    assert sorted(frames) == ["EURUSD=X", "GC=F"]
+    assert list(failures) == ["BAD"] and isinstance(failures["BAD"], RuntimeError)
+    assert sorted(calls) == [("BAD", "7d", "1h"), ("EURUSD=X", "7d", "1h"), ("GC=F", "7d", "1h")]
+
+
+class _FakeTicker:
+    """yf.Ticker stand-in that records history() calls."""
+    downloads = []
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    def history(self, period, interval):
+        self.downloads.append((self.symbol, period, interval))
+        idx = pd.date_range("2025-01-01", periods=3, freq="5min")
+        return pd.DataFrame(
+            {"Open": [1.0, 2.0, 3.0], "High": [2.0, 3.0, 4.0], "Low": [0.5, 1.5, 2.5],
+             "Close": [1.5, 2.5, 3.5], "Volume": [10, 20, 30]},
+            index=idx,
+        )
+
+
+def _fake_yahoo(monkeypatch, tmp_path):
+    monkeypatch.setattr(data_loader, "YF_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(data_loader.yf, "Ticker", _FakeTicker)
+    monkeypatch.setattr(_FakeTicker, "downloads", [])
+    return _FakeTicker.downloads
+
+
+def test_fetch_data_yfinance_uses_disk_cache(monkeypatch, tmp_path):
+    """A repeated fetch is served from the on-disk cache; use_cache=False goes to the network."""
+    downloads = _fake_yahoo(monkeypatch, tmp_path)
+    first = data_loader.fetch_data_yfinance("GC=F", period="60d", interval="1d")
+    second = data_loader.fetch_data_yfinance("GC=F", period="60d", interval="1d")
+    assert downloads == [("GC=F", "60d", "1d")]
+    pd.testing.assert_frame_equal(first, second)
+    data_loader.fetch_data_yfinance("GC=F", period="60d", interval="1d", use_cache=False)
+    assert len(downloads) == 2
+
+
+def test_fetch_data_yfinance_caches_intraday_only_when_enabled(monkeypatch, tmp_path):
+    """Intraday bars are re-downloaded by default; config.YF_CACHE_INTRADAY (--yf-cache) reuses them."""
+    downloads = _fake_yahoo(monkeypatch, tmp_path)
+    monkeypatch.setattr(data_loader.config, "YF_CACHE_INTRADAY", False)
+    data_loader.fetch_data_yfinance("GC=F", period="5d", interval="5m")
+    data_loader.fetch_data_yfinance("GC=F", period="5d", interval="5m")
+    assert len(downloads) == 2
+    monkeypatch.setattr(data_loader.config, "YF_CACHE_INTRADAY", True)
+    data_loader.fetch_data_yfinance("GC=F", period="5d", interval="5m")
+    data_loader.fetch_data_yfinance("GC=F", period="5d", interval="5m")
+    assert len(downloads) == 3
+
+
+def test_yf_cache_put_prunes_files_from_earlier_dates(monkeypatch, tmp_path):
+    """Writing today's entry removes the symbol's cache files from earlier dates, not today's."""
+    _fake_yahoo(monkeypatch, tmp_path)
+    folder = tmp_path / "GC_F"
+    folder.mkdir()
+    (folder / "1d_60d_2000-01-01.pkl").write_bytes(b"old")
+    (folder / "5m_5d_2000-01-01.pkl.123.tmp").write_bytes(b"old")
+    data_loader.fetch_data_yfinance("GC=F", period="5d", interval="1h", use_cache=True)
+    data_loader.fetch_data_yfinance("GC=F", period="60d", interval="1d")
+    assert sorted(p.name for p in folder.iterdir()) == sorted(
+        os.path.basename(data_loader._yf_cache_path("GC=F", period, interval))
+        for period, interval in (("5d", "1h"), ("60d", "1d"))
+    )
+
+
+def test_load_data_csv_lowercases_columns_and_indexes_time(tmp_path):
+    """Headers are lower-cased and the Time column becomes a DatetimeIndex."""
+    path = tmp_path / "bars.csv"
+    path.write_text(
+        "Time,Open,High,Low,Close,Volume\n"
+        "2025-01-01 00:00:00,1.5,2.0,1.0,1.8,10\n"
+        "2025-01-01 00:05:00,1.8,2.2,1.7,2.1,12\n"
+    )
+    df = data_loader.load_data_csv(str(path))
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
+    assert isinstance(df.index, pd.DatetimeIndex)
+    assert df.index[1] == pd.Timestamp("2025-01-01 00:05:00")
+    assert df["close"].tolist() == [1.8, 2.1]
@@ -0,0 +1,94 @@
+"""Unit tests for bot/indicators.py."""
+import numpy as np
+import pandas as pd
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.indicators import detect_fvg, detect_order_block, detect_liquidity_sweep
+
+
+def _random_ohlc(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n)).round(1)
+    open_ = np.roll(close, 1)
+    open_[0] = close[0]
+    high = np.maximum(open_, close) + rng.uniform(0, 1, n).round(1)
+    low = np.minimum(open_, close) - rng.uniform(0, 1, n).round(1)
+    idx = pd.date_range("2024-01-01", periods=n, freq="5min")
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close}, index=idx)
+
+
+def test_detect_fvg_and_order_block_match_shift_formulas():
+    """Array masks equal the Series.shift() definitions, with no flags on the first bars."""
+    df = _random_ohlc()
+    df.iloc[40, df.columns.get_loc("high")] = np.nan
+    out = detect_order_block(detect_fvg(df.copy()))
+    assert out["fvg_bull"].tolist() == (df["low"] > df["high"].shift(2)).tolist()
+    assert out["fvg_bear"].tolist() == (df["high"] < df["low"].shift(2)).tolist()
+    prev_open, prev_close = df["open"].shift(1), df["close"].shift(1)
+    ob_bull = (prev_close < prev_open) & (df["close"] > df["open"]) & (df["close"] > prev_open) & (df["open"] < prev_close)
+    assert out["ob_bull"].tolist() == ob_bull.tolist()
+    assert not out[["fvg_bull", "fvg_bear"]].iloc[:2].any().any()
+    assert out["fvg_bull"].dtype == bool
+
+
+def test_detect_liquidity_sweep_matches_rolling_window():
+    """Sweep flags use the previous lookback bars; a NaN inside the window suppresses the flag."""
+    df = _random_ohlc(seed=1)
+    df.iloc[60, df.columns.get_loc("low")] = np.nan
+    out = detect_liquidity_sweep(df.copy(), lookback=5)
+    recent_high = df["high"].shift(1).rolling(window=5).max()
+    recent_low = df["low"].shift(1).rolling(window=5).min()
+    assert out["sweep_high"].tolist() == ((df["high"] > recent_high) & (df["close"] < recent_high)).tolist()
+    assert out["sweep_low"].tolist() == ((df["low"] < recent_low) & (df["close"] > recent_low)).tolist()
+    assert not detect_liquidity_sweep(df.head(3).copy(), lookback=5)[["sweep_high", "sweep_low"]].any().any()
+
+
+def test_detect_displacement_matches_rolling_mean():
+    """Displacement flags equal the rolling-mean body definition; no helper columns are left behind."""
+    from bot.indicators import detect_displacement
+    df = _random_ohlc(seed=2)
+    df.iloc[80, df.columns.get_loc("open")] = np.nan
+    out = detect_displacement(df, threshold=1.5, window=10)
+    body = (df["close"] - df["open"]).abs()
+    is_large = body > body.rolling(window=10).mean() * 1.5
+    assert out["displacement_bull"].tolist() == (is_large & (df["close"] > df["open"])).tolist()
+    assert out["displacement_bear"].tolist() == (is_large & (df["close"] < df["open"])).tolist()
+    assert "body_size" not in out.columns and out is df
+    assert not detect_displacement(df.head(5), window=10)[["displacement_bull", "displacement_bear"]].any().any()
+
+
+def test_detect_candle_patterns_matches_separate_detectors():
+    """The fused pass writes the same six flag columns, in the same order, as the three detectors."""
+    from bot.indicators import detect_candle_patterns, detect_rejection_candle, detect_displacement
+    df = _random_ohlc(seed=3)
+    df.iloc[30, df.columns.get_loc("open")] = np.nan
+    df.iloc[50, df.columns.get_loc("high")] = df.iloc[50]["low"]
+    expected = detect_displacement(detect_rejection_candle(detect_fvg(df.copy()), wick_ratio=0.5), threshold=1.5, window=10)
+    out = detect_candle_patterns(df.copy(), wick_ratio=0.5)
+    pd.testing.assert_frame_equal(out, expected)
+
+
+def test_calculate_pdl_pdh_uses_last_day_before_current_date():
+    """PDH/PDL come from the last daily bar strictly before the current day (sorted or unsorted index)."""
+    from bot.indicators import calculate_pdl_pdh
+
+    idx = pd.date_range("2025-01-01", periods=4, freq="D")
+    daily = pd.DataFrame({"high": [10.0, 11.0, 12.0, 13.0], "low": [5.0, 6.0, 7.0, 8.0]}, index=idx)
+    assert calculate_pdl_pdh(daily, pd.Timestamp("2025-01-03 14:30")) == (11.0, 6.0)
+    assert calculate_pdl_pdh(daily, pd.Timestamp("2025-01-01 09:00")) == (None, None)
+    assert calculate_pdl_pdh(daily, pd.Timestamp("2025-02-01")) == (13.0, 8.0)
+    shuffled = daily.iloc[[2, 0, 3, 1]]
+    assert calculate_pdl_pdh(shuffled, pd.Timestamp("2025-01-04 01:00")) == (11.0, 6.0)
+
+
+def test_indicator_flag_columns_are_bool():
+    """Every flag column from bot/indicators.py is a NumPy bool column, never object."""
+    from bot.indicators import detect_candle_patterns, detect_rejection_candle, detect_displacement
+    df = _random_ohlc(seed=4)
+    out = detect_liquidity_sweep(detect_order_block(detect_candle_patterns(df.copy())))
+    out = detect_displacement(detect_rejection_candle(out))
+    flags = [c for c in out.columns if c not in ("open", "high", "low", "close")]
+    assert len(flags) == 10
+    assert all(out[c].dtype == bool for c in flags)
@@ -29,6 +29,17 @@ def test_detect_swing_highs_lows(sample_ohlcv_df):
     assert result.iloc[3]['swing_high_price'] == 100
 
 
+def test_detect_swing_highs_lows_skips_nan_neighbours():
+    """A NaN high/low next to a bar doesn't disqualify it: the bar only has to beat the real neighbours."""
+    import numpy as np
+    highs = [1.0, 2.0, 3.0, 2.0, 6.0, np.nan, 3.0, 2.0, 1.0, 2.0, 2.5, 4.0, 3.0, 2.0, 1.0]
+    df = pd.DataFrame({"high": highs, "low": [-h for h in highs]})
+    result = detect_swing_highs_lows(df, swing_length=3)
+    assert result.index[result['swing_high']].tolist() == [4, 11]
+    assert result.index[result['swing_low']].tolist() == [4, 11]
+    assert result.iloc[4]['swing_high_price'] == 6.0
+
+
 def test_detect_break_of_structure(sample_ohlcv_bos_bull):
     """After swing detection, BOS flags when close breaks last swing high/low."""
     df = sample_ohlcv_bos_bull.copy()
@@ -114,3 +125,63 @@ def test_detect_breaker_block_no_invalidated_ob():
     df = detect_break_of_structure(df)
     bb = detect_breaker_block(df, "BULLISH", ob_lookback=10)
     assert bb is None
+
+
+def test_structure_breaks_kernel_matches_numpy_version():
+    """The sequential (numba) BOS kernel and the NumPy fallback flag the same break bars."""
+    import numpy as np
+    from bot import indicators_bos
+
+    rng = np.random.default_rng(7)
+    close = 100 + np.cumsum(rng.normal(0, 1, 500)).round(1)
+    df = pd.DataFrame({"high": close + 0.5, "low": close - 0.5, "close": close})
+    df = detect_swing_highs_lows(df, swing_length=3)
+    for bullish, extreme, mask, price in (
+        (True, "high", "swing_high", "swing_high_price"),
+        (False, "low", "swing_low", "swing_low_price"),
+    ):
+        args = (
+            df["close"].to_numpy(dtype=float), df[extreme].to_numpy(dtype=float),
+            df[mask].to_numpy(dtype=bool), df[price].to_numpy(dtype=float), bullish,
+        )
+        expected = indicators_bos._structure_breaks_py(*args)
+        assert len(expected) > 0
+        assert indicators_bos._structure_breaks_np(*args).tolist() == expected.tolist()
+        assert indicators_bos._structure_breaks(*args).tolist() == expected.tolist()
+
+
+def test_higher_tf_bias_aligned_uses_last_bar_at_or_before_idx():
+    """The higher-TF bar at or before idx decides; no bar yet or no BOS -> not aligned."""
+    from bot.indicators_bos import higher_tf_bias_aligned
+
+    idx = pd.date_range("2025-01-01", periods=3, freq="h")
+    df = pd.DataFrame({"bos_bull": [True, False, False], "bos_bear": [False, False, True]}, index=idx)
+    assert higher_tf_bias_aligned(df, idx[0] + pd.Timedelta(minutes=30), "BULLISH")
+    assert not higher_tf_bias_aligned(df, idx[1], "BULLISH")
+    assert higher_tf_bias_aligned(df, idx[2], "BEARISH")
+    assert not higher_tf_bias_aligned(df, idx[0] - pd.Timedelta(minutes=1), "BULLISH")
+    assert higher_tf_bias_aligned(df.iloc[[2, 0, 1]], idx[2], "BULLISH") is False
+    assert higher_tf_bias_aligned(None, idx[0], "BULLISH")
+
+
+def test_bos_direction_is_categorical(sample_ohlcv_bos_bull):
+    """bos_direction stores int8 codes; reads still return the direction strings or NaN."""
+    df = detect_break_of_structure(detect_swing_highs_lows(sample_ohlcv_bos_bull.copy(), swing_length=2))
+    assert isinstance(df['bos_direction'].dtype, pd.CategoricalDtype)
+    assert df['bos_direction'].cat.codes.dtype == 'int8'
+    assert df['bos_direction'].iloc[5] == 'BULLISH'
+    assert df['bos_direction'][~df['bos_bull'] & ~df['bos_bear']].isna().all()
+
+
+def test_detect_swings_and_bos_matches_two_pass_pipeline():
+    """The single-call swing + BOS pass writes the same columns, in the same order, as the two steps."""
+    import numpy as np
+    from bot.indicators_bos import detect_swings_and_bos
+
+    rng = np.random.default_rng(11)
+    close = 100 + np.cumsum(rng.normal(0, 1, 400)).round(1)
+    df = pd.DataFrame({"high": close + 0.5, "low": close - 0.5, "close": close})
+    for swing_length in (2, 3, 5):
+        expected = detect_break_of_structure(detect_swing_highs_lows(df.copy(), swing_length=swing_length))
+        assert expected['bos_bull'].any()
+        pd.testing.assert_frame_equal(detect_swings_and_bos(df.copy(), swing_length=swing_length), expected)
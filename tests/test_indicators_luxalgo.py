@@ -115,3 +115,17 @@ def test_luxalgo_ob_valid():
     assert ob is not None
     assert ob['direction'] == 'BULLISH'
     assert ob['midpoint'] == (ob['high'] + ob['low']) / 2
+
+
+def test_pivot_high_low_truncated_window_and_ties():
+    """Early pivots use the window clipped at bar 0; ties count as pivots; last left+right bars stay NaN."""
+    from bot.indicators_luxalgo import _pivot_high, _pivot_low
+
+    high = pd.Series([5.0, 3.0, 6.0, 6.0, 2.0, 1.0])
+    ph = _pivot_high(high, left=2, right=1)
+    assert ph.iloc[0] == 5.0  # window clipped to bars 0..1
+    assert pd.isna(ph.iloc[1])
+    assert ph.iloc[2] == 6.0  # equal to the next bar's high -> still a pivot
+    assert ph.iloc[3:].isna().all()
+    pl = _pivot_low(-high, left=2, right=1)
+    assert pl.fillna(0).tolist() == (-ph).fillna(0).tolist()
@@ -0,0 +1,203 @@
+"""Unit tests for bot/live_trading.py (no MT5 terminal: the connector is a recording fake)."""
+import pandas as pd
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot import live_trading
+from bot.connector_interface import TIMEFRAME_D1, TIMEFRAME_H1
+
+
+class FakeConnector:
+    """Records get_bars calls; symbols outside `available` have no data."""
+
+    def __init__(self, available=("XAUUSDm",)):
+        self.available = set(available)
+        self.calls = []
+        self.connected = True
+        self.listed = None  # what symbols_get reports; None = unavailable
+
+    def get_symbol_names(self):
+        return self.listed
+
+    def get_bars(self, symbol, timeframe, count=100):
+        self.calls.append((symbol, timeframe, count))
+        if symbol not in self.available:
+            return None
+        idx = pd.date_range("2025-01-01", periods=count, freq="h")
+        close = pd.Series(range(count), index=idx, dtype=float)
+        return pd.DataFrame({"open": close, "high": close + 1, "low": close - 1, "close": close, "volume": 1.0})
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    fake = FakeConnector()
+    monkeypatch.setattr(live_trading, "get_connector", lambda **kwargs: fake)
+    monkeypatch.setattr(live_trading.config, "MANUAL_APPROVAL", False)
+    return live_trading.LiveTradingEngine(strategy_name="vester", paper_mode=False)
+
+
+def test_get_bars_serves_repeat_and_smaller_fetches_from_cache(engine):
+    """One terminal call per (symbol, timeframe) per iteration; smaller requests get the tail."""
+    first = engine._get_bars("XAUUSDm", TIMEFRAME_H1, 200)
+    assert engine._get_bars("XAUUSDm", TIMEFRAME_H1, 200) is first
+    assert engine._get_bars("XAUUSDm", TIMEFRAME_H1, 50).equals(first.tail(50))
+    assert engine._get_bars("GOLD", TIMEFRAME_D1, 50) is None
+    assert engine._get_bars("GOLD", TIMEFRAME_D1, 50) is None
+    assert engine.mt5.calls == [("XAUUSDm", TIMEFRAME_H1, 200), ("GOLD", TIMEFRAME_D1, 50)]
+    engine._get_bars("XAUUSDm", TIMEFRAME_H1, 500)
+    assert engine.mt5.calls[-1] == ("XAUUSDm", TIMEFRAME_H1, 500)
+    engine._bar_cache.clear()
+    engine._get_bars("XAUUSDm", TIMEFRAME_H1, 200)
+    assert len(engine.mt5.calls) == 4
+
+
+def test_preferred_symbol_is_used_again_after_a_transient_miss(engine, monkeypatch):
+    """A tick where the CLI symbol has no data falls back, but the next tick probes the CLI symbol first again."""
+    class FakeFollow:
+        def __init__(self, df, symbol, verbose):
+            pass
+
+        def prepare_data(self):
+            pass
+
+        def run_backtest(self):
+            return pd.DataFrame()
+
+    monkeypatch.setattr(live_trading, "FollowStrategy", FakeFollow)
+    engine.strategy_name = "follow"
+    engine.cli_symbol = "BTC-USD"
+    assert engine._symbol_candidates([None, "XAUUSD", "XAUUSDm", "XAUUSD"]) == ["XAUUSD", "XAUUSDm"]
+    engine.run_strategy()
+    assert engine.mt5.calls[0][0] == "BTCUSDm" and engine.mt5.calls[-1][0] == "XAUUSDm"
+    engine.mt5.available.add("BTCUSDm")
+    engine._bar_cache.clear()
+    engine.mt5.calls.clear()
+    engine.run_strategy()
+    assert [c[0] for c in engine.mt5.calls] == ["BTCUSDm"]
+
+
+def test_trade_counters_enforce_daily_and_session_limits(engine, monkeypatch):
+    """Per-pair and overall day/session limits read the incremental counters; other days are dropped."""
+    from datetime import datetime, timedelta
+    monkeypatch.setattr(live_trading.config, "MAX_TRADES_PER_DAY", 2)
+    monkeypatch.setattr(live_trading.config, "MAX_TRADES_PER_SESSION", 1)
+    monkeypatch.setattr(live_trading.config, "MAX_TRADES_PER_DAY_PER_PAIR", False)
+    monkeypatch.setattr(live_trading.config, "TRADE_SESSION_HOURS", {h: "all" for h in range(24)})
+    engine.mt5.connected = False
+    now = datetime.utcnow()
+    engine._record_trade_count({"time": now - timedelta(days=1), "symbol": "XAUUSDm"})
+    assert engine._can_trade_symbol("XAUUSDm") == (True, None)
+    engine._record_trade_count({"time": now, "symbol": "XAUUSDm"})
+    assert all(k[0] == now.date() for k in engine._trade_counts)
+    ok, reason = engine._can_trade_symbol("XAUUSDm")
+    assert not ok and "Session limit" in reason
+    assert engine._can_trade_symbol("EURUSDm") == (True, None)
+    assert engine.check_safety_limits() is False
+    assert engine._limit_reason == "Session trade limit reached"
+
+
+def test_bias_of_day_reuses_result_until_bars_change(engine, monkeypatch):
+    """Same closing bars -> cached bias, no BOS pass; a new forming bar recomputes; the bar cache is not mutated."""
+    runs = []
+    real = live_trading.detect_swings_and_bos
+    monkeypatch.setattr(live_trading, "detect_swings_and_bos", lambda df, swing_length=3: runs.append(1) or real(df, swing_length))
+    first = engine._get_bias_of_day("XAUUSDm")
+    assert set(first) == {"daily", "h1"} and len(runs) == 2
+    assert "bos_bull" not in engine._get_bars("XAUUSDm", TIMEFRAME_H1, 200).columns
+    engine._bar_cache.clear()
+    engine._bias_of_hour.clear()
+    assert engine._get_bias_of_day("XAUUSDm") == first and len(runs) == 2
+    engine._bias_of_hour.clear()
+    engine._bar_cache[("XAUUSDm", TIMEFRAME_H1)] = (200, engine.mt5.get_bars("XAUUSDm", TIMEFRAME_H1, 201).iloc[1:])
+    engine._get_bias_of_day("XAUUSDm")
+    assert len(runs) == 3
+    assert engine._get_bias_of_day("GOLD") is None
+
+
+def test_bias_of_day_is_held_for_the_utc_hour(engine):
+    """Within one UTC hour the bias is served without fetching bars; a cached result can't be mutated by callers."""
+    first = engine._get_bias_of_day("XAUUSDm")
+    engine._bar_cache.clear()
+    calls = len(engine.mt5.calls)
+    first["h1"] = "changed"
+    assert engine._get_bias_of_day("XAUUSDm")["h1"] != "changed"
+    assert len(engine.mt5.calls) == calls
+
+
+def test_positions_for_symbol_fetches_once_until_reset(engine):
+    """Positions are grouped by symbol from a single get_positions() call until the snapshot is reset."""
+    calls = []
+    engine.mt5.get_positions = lambda: calls.append(1) or [
+        {"symbol": "XAUUSDm", "ticket": 1}, {"symbol": "EURUSDm", "ticket": 2}, {"symbol": "XAUUSDm", "ticket": 3},
+    ]
+    assert [p["ticket"] for p in engine._get_positions_for_symbol("XAUUSDm")] == [1, 3]
+    assert engine._get_positions_for_symbol("GBPUSDm") == []
+    assert len(calls) == 1
+    engine._positions_by_symbol = None
+    engine._get_positions_for_symbol("EURUSDm")
+    assert len(calls) == 2
+
+
+def test_symbol_candidates_drop_names_the_broker_does_not_list(engine):
+    """Unlisted candidates are skipped; if none are listed the full list is still probed."""
+    engine.mt5.listed = {"XAUUSDm", "EURUSDm"}
+    assert engine._symbol_candidates(["XAUUSD", "GOLD", "XAUUSDm"]) == ["XAUUSDm"]
+    assert engine._symbol_candidates(["XAUUSD", "GOLD"]) == ["XAUUSD", "GOLD"]
+    engine.mt5.listed = {"GOLD"}
+    assert engine._symbol_candidates(["XAUUSD", "GOLD"]) == ["XAUUSD", "GOLD"]
+    engine.mt5.connect = lambda: True
+    engine.connect()
+    assert engine._symbol_candidates(["XAUUSD", "GOLD"]) == ["GOLD"]
+
+
+def test_strategy_rerun_only_when_input_bars_change(engine, monkeypatch):
+    """Same bar OHLC (tick volume aside) reuses the previous signals; a moved forming bar re-runs unless LIVE_EVALUATE_ON_BAR_CLOSE."""
+    runs = []
+
+    class Strat:
+        def prepare_data(self):
+            runs.append(1)
+
+        def run_backtest(self):
+            return pd.DataFrame({"type": ["BUY"]})
+
+    df = engine.mt5.get_bars("XAUUSDm", TIMEFRAME_H1, 10)
+    moved = df.copy()
+    moved.iloc[-1, moved.columns.get_loc("close")] += 0.5
+    ticked = df.copy()
+    ticked.iloc[-1, ticked.columns.get_loc("volume")] += 7
+    first = engine._run_strategy_cached("XAUUSDm", (df, None), Strat)
+    assert engine._run_strategy_cached("XAUUSDm", (df.copy(), None), Strat) is first and len(runs) == 1
+    assert engine._run_strategy_cached("XAUUSDm", (ticked, None), Strat) is first and len(runs) == 1
+    engine._run_strategy_cached("XAUUSDm", (moved, None), Strat)
+    assert len(runs) == 2
+    monkeypatch.setattr(live_trading.config, "LIVE_EVALUATE_ON_BAR_CLOSE", True, raising=False)
+    engine._run_strategy_cached("XAUUSDm", (df, None), Strat)
+    engine._run_strategy_cached("XAUUSDm", (moved, None), Strat)
+    assert len(runs) == 3
+
+
+def test_account_info_fetched_once_until_reset(engine):
+    """Lot sizing, margin check and approval share one account snapshot; a failed fetch is retried."""
+    replies = [None, {"balance": 1000.0}, {"balance": 900.0}]
+    engine.mt5.get_account_info = lambda: replies.pop(0)
+    assert engine._get_account_info() is None
+    assert engine._get_account_info() == {"balance": 1000.0}
+    assert engine._get_account_info() == {"balance": 1000.0}
+    engine._account_info = None
+    assert engine._get_account_info() == {"balance": 900.0}
+
+
+def test_notify_runs_in_background_and_drops_when_backed_up(engine):
+    """Notifications run on the worker thread; once 32 are pending, new ones are dropped."""
+    import threading
+    gate = threading.Event()
+    ran = []
+    for i in range(40):
+        engine._notify(lambda i=i: gate.wait(5) and ran.append(i))
+    assert len(engine._notify_pending) == 32
+    gate.set()
+    live_trading.wait(engine._notify_pending, timeout=5)
+    assert ran == list(range(32))
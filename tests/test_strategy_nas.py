@@ -1,4 +1,5 @@
 """Unit tests for NAS-STRATEGY (strategy_nas, indicators_nas)."""
+import numpy as np
 import pandas as pd
 import pytest
 import sys
@@ -99,6 +100,26 @@ def test_detect_liquidity_sweep_m15():
         assert sweep_rows["sweep_high_size"].iloc[0] >= 0
 
 
+def test_detect_liquidity_sweep_m15_lookback_window():
+    """Only a swing inside the previous `lookback` bars is a liquidity level; the latest one wins."""
+    from bot.indicators_nas import detect_liquidity_sweep_m15
+
+    n = 10
+    df = pd.DataFrame({
+        "open": [100.0] * n, "high": [101.0] * n, "low": [99.0] * n, "close": [100.0] * n,
+        "swing_high": [False] * n, "swing_low": [False] * n,
+        "swing_high_price": [np.nan] * n, "swing_low_price": [np.nan] * n,
+    })
+    df.loc[1, ["swing_high", "swing_high_price"]] = [True, 100.5]
+    df.loc[2, ["swing_high", "swing_high_price"]] = [True, 100.8]
+    out = detect_liquidity_sweep_m15(df, lookback=3)
+    # Bars 3..5 see swing 2 (100.8): high 101 > 100.8 and close 100 < 100.8
+    assert out["sweep_high"].tolist() == [False] * 3 + [True] * 3 + [False] * 4
+    assert out.loc[3, "sweep_high_size"] == pytest.approx(0.2)
+    assert out.loc[3, "sweep_high_price"] == 99.0
+    assert not out["sweep_low"].any()
+
+
 def test_detect_liquidity_sweep_with_min_size():
     """detect_liquidity_sweep filters by min_sweep_points."""
     from bot.indicators_nas import detect_liquidity_sweep
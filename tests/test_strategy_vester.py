@@ -155,3 +155,75 @@ def test_run_backtest_empty_returns_empty_df():
     strat.prepare_data()
     signals = strat.run_backtest()
     assert signals.empty
+
+
+def test_get_fvg_zones_order_and_bounds():
+    """_get_fvg_zones: zones in bar order (bullish first on a shared bar); last bar excluded."""
+    from bot.strategies.strategy_vester import _get_fvg_zones
+    df = pd.DataFrame({
+        "high": [10.0, 11.0, 12.0, 13.0, 14.0],
+        "low": [9.0, 10.0, 11.0, 12.0, 13.0],
+        "fvg_bull": [False, False, True, True, True],
+        "fvg_bear": [False, False, True, False, False],
+    })
+    assert _get_fvg_zones(df, 0, len(df)) == [
+        (11.0, 10.0, "BULLISH"),
+        (9.0, 12.0, "BEARISH"),
+        (12.0, 11.0, "BULLISH"),
+    ]
+    assert _get_fvg_zones(df, 3, 4) == [(12.0, 11.0, "BULLISH")]
+
+
+def test_bars_up_to_and_window_match_boolean_masks():
+    """Binary-search slices equal the index masks they replace, for sorted and unsorted frames."""
+    from bot.strategies.base import _bars_up_to, _bars_window
+
+    idx = pd.date_range("2025-01-01", periods=10, freq="5min")
+    df = pd.DataFrame({"close": range(10)}, index=idx)
+    ts = pd.Timestamp("2025-01-01 00:22")
+    start = pd.Timestamp("2025-01-01 00:10")
+    for frame in (df, df.iloc[[3, 1, 7, 0, 9, 5, 2, 8, 6, 4]]):
+        assert _bars_up_to(frame, ts).equals(frame[frame.index <= ts])
+        assert _bars_window(frame, start, ts).equals(frame[(frame.index >= start) & (frame.index <= ts)])
+        assert _bars_window(frame, start, ts, include_start=False).equals(
+            frame[(frame.index > start) & (frame.index <= ts)]
+        )
+    assert _bars_up_to(df, pd.Timestamp("2024-12-31")).empty
+
+
+def test_flagged_rows_and_before_after_slices():
+    """Swing rows are filtered once; strict before/after slices and last-flagged price match the masks."""
+    from bot.strategies.base import _bars_after, _bars_before, _flagged_rows, _last_flagged_price
+
+    idx = pd.date_range("2025-01-01", periods=8, freq="5min")
+    df = pd.DataFrame(
+        {
+            "swing_high": [False, True, False, True, False, False, True, False],
+            "swing_high_price": [None, 10.0, None, 12.0, None, None, 11.0, None],
+        },
+        index=idx,
+    )
+    swings = _flagged_rows(df, "swing_high")
+    assert swings.index.tolist() == [idx[1], idx[3], idx[6]]
+    assert _bars_before(swings, idx[3]).index.tolist() == [idx[1]]
+    assert _bars_after(swings, idx[3]).index.tolist() == [idx[6]]
+    assert _last_flagged_price(df, "swing_high", "swing_high_price") == 11.0
+    assert _last_flagged_price(df.iloc[:1], "swing_high", "swing_high_price") is None
+
+
+def test_detect_structure_shift_window_bounds():
+    """Latest BOS wins; bull beats bear on the same bar; bar 0 and bars past end_idx are ignored."""
+    idx = pd.date_range("2025-01-01", periods=6, freq="h")
+    df = pd.DataFrame(
+        {
+            "bos_bull": [True, False, True, False, False, True],
+            "bos_bear": [True, False, True, True, False, False],
+        },
+        index=idx,
+    )
+    strat = VesterStrategy(df_h1=df, df_m5=df, df_m1=df, verbose=False)
+    assert strat.detectStructureShift(df) == ("BULLISH", 5)
+    assert strat.detectStructureShift(df, end_idx=5) == ("BEARISH", 3)
+    assert strat.detectStructureShift(df, end_idx=3) == ("BULLISH", 2)
+    assert strat.detectStructureShift(df, end_idx=1) == (None, None)
+    assert strat.detectStructureShift(df.drop(columns=["bos_bull", "bos_bear"])) == (None, None)